@@ -0,0 +1,258 @@
+"""
+End-to-end benchmark of the full middleware pipeline.
+
+Starts ``create_app(config)`` on an aiohttp test server (tarpit delays scaled
+down, alert delivery disabled, DB + log in a temp dir) and replays synthetic
+scanner traffic (benchmarks/traffic.py) at a target rate.  Reports achieved
+req/s, latency percentiles, event-loop lag, DB rows/s and RSS, and stores the
+result as JSON so runs can be compared across commits.
+
+Usage:
+    python -m benchmarks.pipeline [--config config.yaml] [--rate 500]
+                                  [--duration 20] [--concurrency 200]
+                                  [--tarpit-scale 0] [--out results.json]
+                                  [--compare baseline.json] [--max-regression 0.10]
+
+Client and server share one process and event loop, so absolute numbers are
+pessimistic; compare runs made on the same machine.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import aiohttp
+import yaml
+from aiohttp.test_utils import TestServer
+
+from honeypot.app import create_app
+
+from .traffic import TrafficMix
+
+# Metrics compared by --compare: (key, higher_is_better)
+COMPARED = [
+    ("requests_per_second", True),
+    ("latency_p50_ms",      False),
+    ("latency_p99_ms",      False),
+    ("loop_lag_p99_ms",     False),
+    ("db_rows_per_second",  True),
+    ("rss_mb",              False),
+]
+
+
+def bench_config(config: dict, workdir: str, tarpit_scale: float) -> dict:
+    cfg = copy.deepcopy(config)
+    cfg["logging"]["db_path"]  = os.path.join(workdir, "bench.db")
+    cfg["logging"]["log_file"] = os.path.join(workdir, "bench.log")
+    for key in ("base_delay", "max_delay", "post_delay"):
+        cfg["tarpit"][key] = float(cfg["tarpit"][key]) * tarpit_scale
+    # Small, unthrottled fake backups — a 142 MB download at 64 KB/s per hit
+    # would measure the throttle, not the pipeline
+    cfg["backups"] = {**(cfg.get("backups") or {}),
+                      "sql_size_mb": 0.25, "zip_size_mb": 0.25, "bandwidth_kbps": 0}
+    cfg["alerting"]["email"]["enabled"]   = False
+    cfg["alerting"]["webhook"]["enabled"] = False
+    return cfg
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KB on Linux, bytes on macOS — peak rather than current
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def _probe_lag(lags: list, stop: asyncio.Event, interval: float = 0.05) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_benchmark(
+    config: dict,
+    rate: float,
+    duration: float,
+    concurrency: int,
+    seed: int = 1,
+) -> dict:
+    app = create_app(config)
+    # Keep the file log (part of the real cost) but not the console echo
+    hp_log = logging.getLogger("honeypot")
+    for handler in list(hp_log.handlers):
+        if type(handler) is logging.StreamHandler:
+            hp_log.removeHandler(handler)
+
+    server = TestServer(app)
+    await server.start_server()
+    base = f"http://{server.host}:{server.port}"
+
+    traffic   = TrafficMix(seed=seed)
+    latencies: list[float] = []
+    errors    = 0
+    lags: list[float] = []
+    stop_probe = asyncio.Event()
+    probe = asyncio.create_task(_probe_lag(lags, stop_probe))
+    slots = asyncio.Semaphore(concurrency)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def one(req) -> None:
+            nonlocal errors
+            async with slots:
+                t0 = time.perf_counter()
+                try:
+                    async with session.request(
+                        req.method, base + req.path, headers=req.headers,
+                        data=req.data, allow_redirects=False,
+                    ) as resp:
+                        await resp.read()
+                    latencies.append(time.perf_counter() - t0)
+                except aiohttp.ClientError:
+                    errors += 1
+
+        # Open-loop schedule: request i is due at start + i / rate
+        loop    = asyncio.get_running_loop()
+        start   = loop.time()
+        total   = int(rate * duration)
+        pending = set()
+        for i in range(total):
+            delay = start + i / rate - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(one(traffic.next()))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.wait(pending)
+        elapsed = loop.time() - start
+
+    stop_probe.set()
+    await probe
+    rss = rss_mb()
+    await server.close()              # runs on_cleanup → flushes the DB writer
+
+    with sqlite3.connect(config["logging"]["db_path"]) as conn:
+        rows = conn.execute("SELECT COUNT(*) FROM requests").fetchone()[0]
+
+    return {
+        "requests_sent":       total,
+        "requests_completed":  len(latencies),
+        "errors":              errors,
+        "elapsed_seconds":     round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_p50_ms":      round(percentile(latencies, 50) * 1000, 3),
+        "latency_p99_ms":      round(percentile(latencies, 99) * 1000, 3),
+        "latency_max_ms":      round(max(latencies, default=0) * 1000, 3),
+        "loop_lag_p99_ms":     round(percentile(lags, 99) * 1000, 3),
+        "loop_lag_max_ms":     round(max(lags, default=0) * 1000, 3),
+        "db_rows":             rows,
+        "db_rows_per_second":  round(rows / elapsed, 1),
+        "rss_mb":              round(rss, 1),
+    }
+
+
+def compare(current: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Return a list of human-readable regressions beyond ``max_regression``."""
+    failures = []
+    print(f"\n{'metric':<22}{'baseline':>12}{'current':>12}{'change':>10}")
+    for key, higher_is_better in COMPARED:
+        old, new = baseline["results"].get(key), current["results"].get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        print(f"{key:<22}{old:>12}{new:>12}{change:>+10.1%}")
+        worse = -change if higher_is_better else change
+        if worse > max_regression:
+            failures.append(f"{key} regressed {worse:.1%} ({old} → {new})")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--rate", type=float, default=500, help="target requests/second")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of traffic")
+    parser.add_argument("--concurrency", type=int, default=200, help="max in-flight requests")
+    parser.add_argument("--tarpit-scale", type=float, default=0.0,
+                        help="multiply tarpit delays (0 disables them)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.10,
+                        help="fail (exit 1) if any compared metric is this much worse")
+    args = parser.parse_args(argv)
+
+    with open(args.config, encoding="utf-8") as fh:
+        config = yaml.safe_load(fh)
+
+    with tempfile.TemporaryDirectory(prefix="honeypot-bench-") as workdir:
+        cfg = bench_config(config, workdir, args.tarpit_scale)
+        results = asyncio.run(run_benchmark(
+            cfg, args.rate, args.duration, args.concurrency, args.seed,
+        ))
+
+    report = {
+        "benchmark": "pipeline",
+        "commit":    git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "params": {
+            "rate": args.rate, "duration": args.duration,
+            "concurrency": args.concurrency, "tarpit_scale": args.tarpit_scale,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        failures = compare(report, baseline, args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Synthetic scanner traffic for benchmarks.
+
+Deterministic for a given seed: a mix of scanner / tool / browser User-Agents,
+wordlist and bait paths, internal vs external source IPs (sent through
+X-Forwarded-For) and occasional credential / SQLi POSTs to /admin/login.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+USER_AGENTS = [
+    # (weight, user agent)
+    (20, "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+         "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"),
+    (15, "gobuster/3.6"),
+    (10, "Mozilla/5.0 (compatible; Nmap Scripting Engine; https://nmap.org/book/nse.html)"),
+    (10, "sqlmap/1.7.2#stable (https://sqlmap.org)"),
+    (8,  "Mozilla/5.00 (Nikto/2.5.0) (Evasions:None) (Test:000001)"),
+    (8,  "curl/8.4.0"),
+    (6,  "python-requests/2.31.0"),
+    (5,  "Fuzz Faster U Fool v2.1.0"),
+    (5,  "Go-http-client/1.1"),
+    (5,  "Mozilla/5.0 zgrab/0.x"),
+    (3,  ""),
+]
+
+BAIT_PATHS = [
+    "/", "/robots.txt", "/.env", "/config.php", "/config", "/admin", "/admin/login",
+    "/admin/dashboard", "/admin/users", "/backup/", "/db_backup.sql", "/backup.zip",
+    "/old-api/v1/users", "/old-api/v1/config", "/phpmyadmin/", "/manager/html",
+]
+
+WORDLIST = [
+    "/wp-login.php", "/wp-admin/", "/xmlrpc.php", "/.git/HEAD", "/.svn/entries",
+    "/server-status", "/actuator/env", "/api/v1/users", "/login", "/console",
+    "/cgi-bin/test.cgi", "/index.php?page=../../etc/passwd", "/shell.jsp",
+    "/backup.tar.gz", "/dump.sql", "/uploads/", "/.DS_Store", "/web.config",
+    "/search?q=1%27%20union%20select%20null--", "/images/logo.png",
+]
+
+SQLI_USERNAMES = ["' or 1=1--", "admin'--", "' OR '1'='1", "1' UNION SELECT 1,2--"]
+PLAIN_USERNAMES = ["admin", "root", "administrator", "jsmith", "test"]
+PASSWORDS = ["admin", "password", "123456", "C0rp!DMS#2011", "Dms@2011!Prod#9x"]
+
+
+@dataclass
+class SyntheticRequest:
+    method: str
+    path: str
+    source_ip: str
+    headers: dict = field(default_factory=dict)
+    data: Optional[dict] = None
+
+
+class TrafficMix:
+    def __init__(
+        self,
+        seed: int = 1,
+        internal_ratio: float = 0.3,
+        bait_ratio: float = 0.6,
+        post_ratio: float = 0.05,
+        ip_pool: int = 2000,
+    ):
+        self.rng            = random.Random(seed)
+        self.internal_ratio = internal_ratio
+        self.bait_ratio     = bait_ratio
+        self.post_ratio     = post_ratio
+        self._uas     = [ua for _, ua in USER_AGENTS]
+        self._weights = [w for w, _ in USER_AGENTS]
+        self._ips     = [self.random_ip() for _ in range(ip_pool)]
+
+    def random_ip(self, internal: Optional[bool] = None) -> str:
+        rng = self.rng
+        if internal is None:
+            internal = rng.random() < self.internal_ratio
+        if internal:
+            return f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+        while True:
+            first = rng.randrange(1, 224)
+            if first not in (10, 127, 172, 192):
+                return f"{first}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+
+    def next(self, source_ip: Optional[str] = None) -> SyntheticRequest:
+        rng = self.rng
+        ip  = source_ip or rng.choice(self._ips)
+        ua  = rng.choices(self._uas, weights=self._weights)[0]
+        headers = {"X-Forwarded-For": ip, "User-Agent": ua, "Accept": "*/*"}
+
+        if rng.random() < self.post_ratio:
+            user = rng.choice(SQLI_USERNAMES if rng.random() < 0.4 else PLAIN_USERNAMES)
+            return SyntheticRequest(
+                "POST", "/admin/login", ip, headers,
+                {"username": user, "password": rng.choice(PASSWORDS)},
+            )
+
+        path = rng.choice(BAIT_PATHS if rng.random() < self.bait_ratio else WORDLIST)
+        return SyntheticRequest("GET", path, ip, headers)
+
+    def __iter__(self) -> Iterator[SyntheticRequest]:
+        while True:
+            yield self.next()
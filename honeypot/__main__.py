@@ -1,4 +1,3 @@
-import sys
-from .app import run
+from .cli import main
 
-run(sys.argv[1] if len(sys.argv) > 1 else "config.yaml")
+main()
@@ -0,0 +1,77 @@
+"""
+Admin interface — operator-only endpoints on a separate bind address.
+
+Served by its own aiohttp application on ``admin.host:admin.port`` (default
+127.0.0.1:9100).  None of these routes exist on the bait app, and startup
+refuses an admin address that overlaps the bait listener, so attackers
+probing the honeypot can never reach them.
+
+  GET  /metrics         Prometheus text exposition (see metrics.py)
+  POST /debug/profile   start a time-boxed profiling session (see profiling.py)
+  GET  /debug/profile   current / last profiling session
+"""
+
+from aiohttp import web
+
+from .metrics import REGISTRY
+from .profiling import Profiler
+
+ADMIN_DEFAULTS = {"enabled": True, "host": "127.0.0.1", "port": 9100}
+
+
+def admin_settings(config: dict) -> dict:
+    """Effective admin config, validated against the bait listener."""
+    cfg = {**ADMIN_DEFAULTS, **(config.get("admin") or {})}
+    if cfg["enabled"]:
+        srv = config["server"]
+        same_port = int(cfg["port"]) == int(srv["port"])
+        overlapping = (
+            cfg["host"] == srv["host"]
+            or "0.0.0.0" in (cfg["host"], srv["host"])
+            or "::" in (cfg["host"], srv["host"])
+        )
+        if same_port and overlapping:
+            raise ValueError(
+                f"admin interface {cfg['host']}:{cfg['port']} overlaps the bait "
+                f"listener {srv['host']}:{srv['port']} — choose another port"
+            )
+    return cfg
+
+
+def create_admin_app(
+    config: dict,
+    extra_metrics=None,
+    profiler: Profiler = None,
+) -> web.Application:
+    """
+    ``extra_metrics`` is an optional callable returning metric snapshots to
+    merge into /metrics (the supervisor passes its workers' snapshots).
+    """
+    profiler = profiler or Profiler.from_config(config)
+
+    async def handle_metrics(request: web.Request) -> web.Response:
+        snapshots = extra_metrics() if extra_metrics else ()
+        return web.Response(
+            body=REGISTRY.render(snapshots).encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    async def handle_profile_start(request: web.Request) -> web.Response:
+        try:
+            seconds = float(request.query["seconds"]) if "seconds" in request.query else None
+            session = profiler.start(seconds, request.query.get("mode", "all"))
+        except ValueError as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+        except RuntimeError as exc:
+            return web.json_response({"error": str(exc), "active": profiler.active}, status=409)
+        return web.json_response(session, status=202)
+
+    async def handle_profile_status(request: web.Request) -> web.Response:
+        return web.json_response({"active": profiler.active, "last": profiler.last})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    app.router.add_post("/debug/profile", handle_profile_start)
+    app.router.add_get("/debug/profile", handle_profile_status)
+    app["config"] = config
+    return app
@@ -10,10 +10,14 @@ import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from datetime import datetime
+from time import perf_counter
 from typing import Optional
 
 import httpx
 
+from .metrics import ALERT_SEND_SECONDS, ALERTS
+from .persona import Persona
+
 logger = logging.getLogger("honeypot")
 
 # Colour codes used in Slack / Teams attachment cards
@@ -29,6 +33,7 @@ class HoneypotAlerter:
     def __init__(self, config: dict):
         self._email_cfg   = config["alerting"]["email"]
         self._webhook_cfg = config["alerting"]["webhook"]
+        self._node        = Persona.from_config(config).server_name
 
     # ── Public API ────────────────────────────────────────────────────────────
 
@@ -40,24 +45,34 @@ class HoneypotAlerter:
         endpoints: list,
         scanner_type: Optional[str],
         details: str,
+        timestamp: Optional[str] = None,      # ISO-8601 from the RequestContext
     ) -> None:
-        ts = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+        when = datetime.fromisoformat(timestamp) if timestamp else datetime.utcnow()
+        ts = when.strftime("%Y-%m-%d %H:%M:%S UTC")
 
         if self._email_cfg.get("enabled"):
+            t0 = perf_counter()
             try:
                 self._send_email(source_ip, severity, alert_type,
                                  endpoints, scanner_type, details, ts)
+                ALERTS.labels("email", "sent").inc()
                 logger.info(f"Alert email sent for {source_ip}")
             except Exception as exc:
+                ALERTS.labels("email", "failed").inc()
                 logger.error(f"Email alert failed for {source_ip}: {exc}")
+            ALERT_SEND_SECONDS.labels("email").observe(perf_counter() - t0)
 
         if self._webhook_cfg.get("enabled") and self._webhook_cfg.get("url"):
+            t0 = perf_counter()
             try:
                 await self._send_webhook(source_ip, severity, alert_type,
                                          endpoints, scanner_type, details, ts)
+                ALERTS.labels("webhook", "sent").inc()
                 logger.info(f"Webhook alert sent for {source_ip}")
             except Exception as exc:
+                ALERTS.labels("webhook", "failed").inc()
                 logger.error(f"Webhook alert failed for {source_ip}: {exc}")
+            ALERT_SEND_SECONDS.labels("webhook").observe(perf_counter() - t0)
 
     # ── Email ─────────────────────────────────────────────────────────────────
 
@@ -89,8 +104,8 @@ class HoneypotAlerter:
                 srv.login(cfg["username"], cfg["password"])
             srv.send_message(msg)
 
-    @staticmethod
     def _email_body(
+        self,
         source_ip: str,
         severity: str,
         alert_type: str,
@@ -125,7 +140,7 @@ ACTION REQUIRED
   3. Begin incident response — assume full compromise.
 
 This alert was generated by the Corporate Honeypot System.
-Honeypot node: CORP-INTRANET-OLD01
+Honeypot node: {self._node}
 ──────────────────────────────────────────────────
 """
 
@@ -165,7 +180,7 @@ Honeypot node: CORP-INTRANET-OLD01
                             "short": False,
                         },
                     ],
-                    "footer": "Corporate Honeypot | CORP-INTRANET-OLD01",
+                    "footer": f"Corporate Honeypot | {self._node}",
                 }
             ],
         }
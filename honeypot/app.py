@@ -2,26 +2,43 @@
 Main aiohttp application factory.
 
 Middleware execution order for every request:
-  1. Extract source IP
+  1. Extract source IP and snapshot the request into a RequestContext
   2. Fingerprint (passive — no network I/O)
-  3. Tarpit delay (async sleep — non-blocking)
-  4. Log to SQLite + log file
+  3. Read the body and parse the form once
+  4. Log to SQLite (background writer) + log file
   5. Evaluate alert conditions
-  6. Call route handler
-  7. Inject fake server headers into response
+  6. Tarpit delay (async sleep — non-blocking); after detection, so a client
+     that gives up mid-sleep (runtime.handler_cancellation) is still logged
+  7. Call route handler
+  8. Inject fake server headers into response (on_response_prepare, so
+     streamed responses that send their headers early get them too)
+
+Logging and alert evaluation are handled by RequestProcessor — inline in
+single-process mode, or in the supervisor process when running with
+``--workers N`` (see workers.py).
 """
 
 import asyncio
+import ipaddress
 import logging
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from time import perf_counter
 from typing import Optional
 
 import yaml
 from aiohttp import web
 
+from . import runtime
+from .admin import admin_settings, create_admin_app
 from .alerter import HoneypotAlerter
+from .backups import BackupSettings
+from .context import CONTEXT_KEY, RequestContext
 from .fingerprint import fingerprint_request
 from .logger import HoneypotLogger, SEVERITY_RANK
+from .metrics import STAGE
+from .persona import Persona
+from .profiling import Profiler, install_signal_handler
 from .routes import setup_routes
 from .tarpit import TarpitMiddleware
 
@@ -36,27 +53,86 @@ class AlertTracker:
     """
     Prevents alert storms by suppressing repeated alerts for the same IP
     within a cooldown window — unless the severity has escalated.
+
+    Entries live in an OrderedDict kept in record order.  Because every entry
+    shares the same cooldown, record order is also expiry order, so expired
+    entries are popped from the front in O(1) and memory stays bounded by the
+    alert rate × cooldown (and by ``max_entries`` as a hard cap).
+
+    With ``subnet_prefix_v4`` / ``subnet_prefix_v6`` set, the cooldown is also
+    applied per subnet, so an attacker hopping addresses inside e.g. a /24
+    cannot bypass deduplication.
     """
 
-    def __init__(self, cooldown_seconds: int = 300):
-        self._cooldown = timedelta(seconds=cooldown_seconds)
-        self._state: dict[str, dict] = {}   # {ip: {"time": datetime, "severity": str}}
+    def __init__(
+        self,
+        cooldown_seconds: int = 300,
+        max_entries: int = 50_000,
+        subnet_prefix_v4: int = 0,
+        subnet_prefix_v6: int = 0,
+        clock=time.monotonic,
+    ):
+        self._cooldown = float(cooldown_seconds)
+        self._max_entries = max(1, int(max_entries))
+        self._prefix_v4 = int(subnet_prefix_v4 or 0)
+        self._prefix_v6 = int(subnet_prefix_v6 or 0)
+        self._clock = clock
+        # {key: (expires_at, severity_rank)} — key is an IP or "net:<cidr>"
+        self._state: "OrderedDict[str, tuple[float, int]]" = OrderedDict()
+
+    # ── internal helpers ──────────────────────────────────────────────────────
+
+    def _expire(self, now: float) -> None:
+        state = self._state
+        while state:
+            key, (expires_at, _) = next(iter(state.items()))
+            if expires_at >= now:
+                break
+            del state[key]
+
+    def _subnet_key(self, ip: str) -> Optional[str]:
+        if not (self._prefix_v4 or self._prefix_v6):
+            return None
+        try:
+            addr = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        prefix = self._prefix_v4 if addr.version == 4 else self._prefix_v6
+        if not prefix:
+            return None
+        net = ipaddress.ip_network(f"{addr}/{prefix}", strict=False)
+        return f"net:{net}"
 
-    def should_alert(self, ip: str, severity: str) -> bool:
-        if ip not in self._state:
-            return True
+    def _keys(self, ip: str) -> tuple:
+        subnet = self._subnet_key(ip)
+        return (ip, subnet) if subnet else (ip,)
 
-        last = self._state[ip]
-        if SEVERITY_RANK.get(severity, 0) > SEVERITY_RANK.get(last["severity"], 0):
-            return True                                     # severity escalated
+    # ── public API ────────────────────────────────────────────────────────────
 
-        if datetime.utcnow() - last["time"] > self._cooldown:
-            return True                                     # cooldown expired
+    def should_alert(self, ip: str, severity: str) -> bool:
+        self._expire(self._clock())
+        rank = SEVERITY_RANK.get(severity, 0)
 
-        return False
+        for key in self._keys(ip):
+            entry = self._state.get(key)
+            if entry is not None and rank <= entry[1]:
+                return False                                # still cooling down
+        return True                                         # new, expired or escalated
 
     def record(self, ip: str, severity: str) -> None:
-        self._state[ip] = {"time": datetime.utcnow(), "severity": severity}
+        now = self._clock()
+        self._expire(now)
+        entry = (now + self._cooldown, SEVERITY_RANK.get(severity, 0))
+
+        for key in self._keys(ip):
+            self._state[key] = entry
+            self._state.move_to_end(key)
+
+        while len(self._state) > self._max_entries:
+            self._state.popitem(last=False)                 # hard cap: drop oldest
+
+    def __len__(self) -> int:
+        return len(self._state)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -75,66 +151,51 @@ def _alert_type(is_internal: bool, method: str, fp) -> str:
     return "SUSPICIOUS ACCESS"
 
 
-def build_middleware(
-    tarpit: TarpitMiddleware,
-    hp_logger: HoneypotLogger,
-    alerter: HoneypotAlerter,
-    tracker: AlertTracker,
-    config: dict,
-):
-    server_cfg = config["server"]
-    fake_server  = server_cfg["fake_identity"]
-    fake_powered = server_cfg.get("fake_powered_by", "PHP/5.2.17")
-
-    @web.middleware
-    async def honeypot_middleware(request: web.Request, handler) -> web.Response:
-
-        # ── 1. Source IP ──────────────────────────────────────────────────────
-        forwarded = request.headers.get("X-Forwarded-For", "")
-        source_ip = forwarded.split(",")[0].strip() if forwarded else (request.remote or "unknown")
-
-        # ── 2. Passive fingerprint ────────────────────────────────────────────
-        fp = fingerprint_request(
-            request.headers.get("User-Agent", ""),
-            request.path,
-            dict(request.headers),
-        )
+class RequestProcessor:
+    """
+    Pipeline steps 4-5: log the request and evaluate alert conditions.
 
-        # ── 3. Tarpit delay ───────────────────────────────────────────────────
-        await tarpit.apply_delay(source_ip, request.method)
+    In single-process mode this runs inline in the middleware.  In worker mode
+    (see workers.py) it runs only in the supervisor, which is then the single
+    SQLite writer and the single owner of alert deduplication state.
+    """
 
-        # ── 4. Read & cache request body (aiohttp caches after first read) ───
-        try:
-            body = await request.text()
-        except Exception:
-            body = ""
-
-        # ── 5. Log ────────────────────────────────────────────────────────────
-        record = hp_logger.log_request(
-            source_ip=source_ip,
-            method=request.method,
-            path=request.path,
-            query_params=dict(request.rel_url.query),
-            headers=dict(request.headers),
-            body=body,
-            fingerprint_result=fp,
-        )
+    def __init__(
+        self,
+        hp_logger: HoneypotLogger,
+        alerter: HoneypotAlerter,
+        tracker: AlertTracker,
+    ):
+        self.hp_logger = hp_logger
+        self.alerter   = alerter
+        self.tracker   = tracker
+
+    def process(self, ctx: RequestContext) -> dict:
+        hp_logger = self.hp_logger
+        fp = ctx.fingerprint
+
+        # ── 5. Classify + log (DB write happens on the background writer) ────
+        t0 = perf_counter()
+        record = hp_logger.log_request(ctx)
+        t1 = perf_counter()
+        STAGE["log"].observe(t1 - t0)
 
         # ── 6. Alert logic ────────────────────────────────────────────────────
-        is_internal = bool(record["is_internal"])
-        severity    = record["severity"]
+        is_internal = ctx.is_internal
+        severity    = ctx.severity
+        source_ip   = ctx.source_ip
 
         needs_alert = (
-            (is_internal and hp_logger.is_first_contact(source_ip))
-            or (is_internal and request.method == "POST")
+            (is_internal and record["first_contact"])
+            or (is_internal and ctx.method == "POST")
             or (is_internal and fp.scanner_name)
             or (not is_internal and fp.scanner_name)
         )
 
-        if needs_alert and tracker.should_alert(source_ip, severity):
-            tracker.record(source_ip, severity)
+        if needs_alert and self.tracker.should_alert(source_ip, severity):
+            self.tracker.record(source_ip, severity)
             history    = hp_logger.get_ip_history(source_ip)
-            alert_type = _alert_type(is_internal, request.method, fp)
+            alert_type = _alert_type(is_internal, ctx.method, fp)
 
             hp_logger.log_alert(
                 source_ip=source_ip,
@@ -143,67 +204,173 @@ def build_middleware(
                 endpoints=history["endpoints"],
                 scanner_type=fp.scanner_name,
                 details=fp.details,
+                timestamp=ctx.timestamp,
             )
 
             # Fire-and-forget: never block the HTTP response
             asyncio.create_task(
-                alerter.send_alert(
+                self.alerter.send_alert(
                     source_ip=source_ip,
                     severity=severity,
                     alert_type=alert_type,
                     endpoints=history["endpoints"],
                     scanner_type=fp.scanner_name,
                     details=fp.details,
+                    timestamp=ctx.timestamp,
                 )
             )
+            STAGE["alert"].observe(perf_counter() - t1)
+
+        return record
+
+    def close(self) -> None:
+        self.hp_logger.close()
+
+
+def build_middleware(
+    tarpit: TarpitMiddleware,
+    processor,                      # RequestProcessor | workers.QueueForwarder
+    config: dict,
+):
+    @web.middleware
+    async def honeypot_middleware(request: web.Request, handler) -> web.Response:
+
+        # ── 1. Source IP + one snapshot of headers / query / timestamp ───────
+        ctx = RequestContext.from_request(request)
+        request[CONTEXT_KEY] = ctx
+
+        # ── 2. Passive fingerprint ────────────────────────────────────────────
+        t0 = perf_counter()
+        ctx.fingerprint = fingerprint_request(ctx.user_agent, ctx.path, ctx.headers)
+        t1 = perf_counter()
+        STAGE["fingerprint"].observe(t1 - t0)
+
+        # ── 3. Read body + parse form once (aiohttp caches the raw body) ─────
+        await ctx.read_body(request)
+        t2 = perf_counter()
+        STAGE["body"].observe(t2 - t1)
+
+        # ── 4-5. Log + alert (inline, or forwarded to the supervisor) ─────────
+        processor.process(ctx)
+
+        # ── 6. Tarpit delay ───────────────────────────────────────────────────
+        t3 = perf_counter()
+        await tarpit.apply_delay(ctx.source_ip, ctx.method)
+        STAGE["tarpit"].observe(perf_counter() - t3)
 
         # ── 7. Call route handler ─────────────────────────────────────────────
+        t4 = perf_counter()
         response = await handler(request)
+        STAGE["handler"].observe(perf_counter() - t4)
+        return response
+
+    return honeypot_middleware
+
+
+def build_identity_headers(persona: Persona):
+    """Step 8 — runs for every response right before its headers are sent."""
+    fake_server, fake_powered, generator = (
+        persona.server_header, persona.powered_by, persona.generator,
+    )
 
-        # ── 8. Inject fake legacy server headers ──────────────────────────────
+    async def inject_identity_headers(request: web.Request, response: web.StreamResponse) -> None:
         response.headers["Server"]       = fake_server
         response.headers["X-Powered-By"] = fake_powered
-        response.headers["X-Generator"]  = "DMS v2.1"
+        response.headers["X-Generator"]  = generator
         # Remove headers that reveal we are a modern Python server
         response.headers.pop("X-Content-Type-Options", None)
 
-        return response
-
-    return honeypot_middleware
+    return inject_identity_headers
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Application factory
 # ─────────────────────────────────────────────────────────────────────────────
 
-def create_app(config: dict) -> web.Application:
-    tarpit   = TarpitMiddleware(config)
-    hp_logger = HoneypotLogger(config)
-    alerter  = HoneypotAlerter(config)
-    tracker  = AlertTracker(config["alerting"].get("cooldown_seconds", 300))
+def build_tracker(config: dict) -> AlertTracker:
+    alert_cfg = config["alerting"]
+    return AlertTracker(
+        cooldown_seconds=alert_cfg.get("cooldown_seconds", 300),
+        max_entries=alert_cfg.get("max_tracked", 50_000),
+        subnet_prefix_v4=alert_cfg.get("subnet_prefix_v4", 0),
+        subnet_prefix_v6=alert_cfg.get("subnet_prefix_v6", 0),
+    )
+
+
+def build_processor(config: dict) -> RequestProcessor:
+    return RequestProcessor(
+        HoneypotLogger(config),
+        HoneypotAlerter(config),
+        build_tracker(config),
+    )
+
+
+def create_app(config: dict, processor=None) -> web.Application:
+    """
+    Build the bait application.  ``processor`` defaults to an in-process
+    RequestProcessor; worker processes pass a queue forwarder instead.
+    """
+    tarpit = TarpitMiddleware(config)
+    if processor is None:
+        processor = build_processor(config)
 
-    middleware = build_middleware(tarpit, hp_logger, alerter, tracker, config)
+    middleware = build_middleware(tarpit, processor, config)
 
+    persona = Persona.from_config(config)
     app = web.Application(middlewares=[middleware])
-    setup_routes(app)
+    app.on_response_prepare.append(build_identity_headers(persona))
+    setup_routes(app, persona, BackupSettings.from_config(config))
     app["config"] = config
+    if isinstance(processor, RequestProcessor):
+        app.on_cleanup.append(lambda _app: _close_processor(processor))
     return app
 
 
+async def _close_processor(processor: RequestProcessor) -> None:
+    """Flush the background DB writer on shutdown."""
+    await asyncio.get_running_loop().run_in_executor(None, processor.close)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
-# Entry point (used by main.py)
+# Entry point (used by cli.py)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def run(config_path: str = "config.yaml") -> None:
+def load_config(config_path: str) -> dict:
     with open(config_path, encoding="utf-8") as fh:
-        config = yaml.safe_load(fh)
+        return yaml.safe_load(fh)
+
+
+def run(config_path: str = "config.yaml", workers: Optional[int] = None) -> None:
+    config = load_config(config_path)
 
     srv = config["server"]
-    app = create_app(config)
+    workers = int(workers or srv.get("workers", 1))
+    settings = runtime.RuntimeSettings.from_config(config)
+    admin_cfg = admin_settings(config)
 
     print(f"[*] Honeypot starting on  {srv['host']}:{srv['port']}")
     print(f"[*] Posing as             {srv['fake_identity']}")
     print(f"[*] Logs → {config['logging']['log_file']}")
     print(f"[*] DB   → {config['logging']['db_path']}")
-
-    web.run_app(app, host=srv["host"], port=int(srv["port"]), access_log=None)
+    if admin_cfg["enabled"]:
+        print(f"[*] Admin / metrics       {admin_cfg['host']}:{admin_cfg['port']}")
+    runtime.print_report(settings)
+
+    if workers > 1:
+        from .workers import run_workers
+        print(f"[*] Workers               {workers} (SO_REUSEPORT)")
+        run_workers(config, workers, settings)
+        return
+
+    async def _main() -> None:
+        profiler = Profiler.from_config(config)
+        install_signal_handler(profiler)
+        listeners = [(create_app(config), srv["host"], srv["port"])]
+        if admin_cfg["enabled"]:
+            listeners.append((
+                create_admin_app(config, profiler=profiler),
+                admin_cfg["host"], admin_cfg["port"],
+            ))
+        await runtime.serve(listeners, settings)
+
+    runtime.run(_main(), settings)
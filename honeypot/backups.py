@@ -0,0 +1,272 @@
+"""
+Fake backup downloads — /backup.zip and /db_backup.sql.
+
+Both are generated lazily, chunk by chunk, from a seed: the same sensor always
+serves the same bytes, yet nothing larger than one chunk is ever held in
+memory, whatever the advertised size.  Downloads are throttled to
+``backups.bandwidth_kbps`` so an exfiltration attempt keeps the attacker's
+connection (and attention) for a long time.
+
+  db_backup.sql  the persona's MySQL dump (users, api_keys, …) followed by a
+                 ``documents`` table of seeded rows, padded to the exact size
+  backup.zip     a valid ZIP of seeded "documents" (stored, with data
+                 descriptors and a central directory) — opens in any unzip
+                 tool once fully downloaded.  Capped below 4 GiB (no ZIP64).
+"""
+
+import asyncio
+import random
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
+
+from aiohttp import web
+
+from .fake_content import get_sql_dump
+from .metrics import BACKUP_BYTES, BACKUP_STREAMS
+from .persona import Persona
+
+MB = 1024 * 1024
+ZIP_MAX_BYTES = 0xFFFFFFFF          # offsets and sizes are 32-bit without ZIP64
+
+
+@dataclass(frozen=True)
+class BackupSettings:
+    enabled: bool = True
+    sql_size_mb: float = 18
+    zip_size_mb: float = 142
+    bandwidth_kbps: float = 64      # per download; 0 = unthrottled
+    chunk_kb: int = 16
+    seed: str = ""                  # default: the persona's server name
+
+    @classmethod
+    def from_config(cls, config: dict) -> "BackupSettings":
+        cfg = config.get("backups") or {}
+        settings = cls(
+            enabled=bool(cfg.get("enabled", True)),
+            sql_size_mb=float(cfg.get("sql_size_mb", 18)),
+            zip_size_mb=float(cfg.get("zip_size_mb", 142)),
+            bandwidth_kbps=float(cfg.get("bandwidth_kbps", 64)),
+            chunk_kb=max(1, int(cfg.get("chunk_kb", 16))),
+            seed=str(cfg.get("seed", "")),
+        )
+        if settings.zip_size_mb * MB > ZIP_MAX_BYTES:
+            raise ValueError("backups.zip_size_mb must stay below 4096 (no ZIP64 support)")
+        return settings
+
+    @property
+    def sql_bytes(self) -> int:
+        return int(self.sql_size_mb * MB)
+
+    @property
+    def zip_bytes(self) -> int:
+        return int(self.zip_size_mb * MB)
+
+    @staticmethod
+    def listing_size(size: int) -> str:
+        """Apache mod_autoindex style: 18M, 142M, 2.4G."""
+        if size >= 1024 * MB:
+            return f"{size / (1024 * MB):.1f}G"
+        return f"{size // MB}M" if size >= MB else f"{size // 1024}K"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Seeded content
+# ─────────────────────────────────────────────────────────────────────────────
+
+_DEPARTMENTS = ("Finance", "HR", "Legal", "Operations", "IT", "Sales", "Procurement")
+_DOC_KINDS = (
+    ("Budget", "xlsx"), ("Salary_Review", "xlsx"), ("Contract", "pdf"),
+    ("Board_Minutes", "docx"), ("Audit_Report", "pdf"), ("Forecast", "xlsx"),
+    ("Employee_Records", "xlsx"), ("Vendor_Invoices", "pdf"), ("Policy", "docx"),
+    ("Network_Diagram", "vsd"), ("Passwords_OLD", "xlsx"), ("Merger_Plan", "pptx"),
+)
+_CLASSIFICATIONS = ("public", "internal", "internal", "confidential", "restricted")
+
+
+def _document(rng: random.Random, persona: Persona) -> tuple:
+    dept = rng.choice(_DEPARTMENTS)
+    kind, ext = rng.choice(_DOC_KINDS)
+    year = rng.randint(persona.first_year, persona.last_year)
+    name = f"{dept}_{kind}_{year}_Q{rng.randint(1, 4)}{rng.choice(('', '_v2', '_FINAL', '_DRAFT'))}.{ext}"
+    return dept, name, year
+
+
+def _dos_datetime(when: datetime) -> tuple:
+    time = (when.hour << 11) | (when.minute << 5) | (when.second // 2)
+    date = ((when.year - 1980) << 9) | (when.month << 5) | when.day
+    return time, date
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Generators (each yields chunks summing to exactly the advertised size)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SqlDump:
+    _LOCK   = "\n--\n-- Dumping data for table `documents`\n--\n\nLOCK TABLES `documents` WRITE;\n"
+    _FOOTER = "UNLOCK TABLES;\n\n-- Dump completed on {date}  3:14:07\n"
+    _ROWS_PER_INSERT = 50
+
+    def __init__(self, persona: Persona, size: int, seed: str, chunk: int):
+        self.persona = persona
+        self.seed    = seed
+        self.chunk   = chunk
+        self.head    = (get_sql_dump(persona) + self._LOCK).encode("utf-8")
+        self.footer  = self._FOOTER.format(date=f"{persona.last_year}-02-01").encode("utf-8")
+        self.size    = max(size, len(self.head) + len(self.footer))
+
+    def __iter__(self) -> Iterator[bytes]:
+        p, rng = self.persona, random.Random(f"{self.seed}:sql")
+        budget = self.size - len(self.head) - len(self.footer)
+        buf = bytearray(self.head)
+        doc_id = 1
+        while True:
+            rows = []
+            for _ in range(self._ROWS_PER_INSERT):
+                dept, name, year = _document(rng, p)
+                rows.append(
+                    f"({doc_id},'{name}','D:\\\\intranet\\\\uploads\\\\{dept}\\\\{name}',"
+                    f"{rng.randint(1, 51)},'{rng.choice(_CLASSIFICATIONS)}',"
+                    f"'{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} "
+                    f"{rng.randint(7, 19):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}')"
+                )
+                doc_id += 1
+            stmt = ("INSERT INTO `documents` VALUES " + ",".join(rows) + ";\n").encode("utf-8")
+            if len(stmt) > budget:
+                break
+            budget -= len(stmt)
+            buf += stmt
+            while len(buf) >= self.chunk:
+                yield bytes(buf[:self.chunk])
+                del buf[:self.chunk]
+        buf += b"\n" * budget + self.footer
+        while buf:
+            yield bytes(buf[:self.chunk])
+            del buf[:self.chunk]
+
+
+class ZipArchive:
+    _LOCAL   = struct.Struct("<IHHHHHIIIHH")       # local file header (30 bytes)
+    _DESC    = struct.Struct("<IIII")               # data descriptor (16 bytes)
+    _CENTRAL = struct.Struct("<IHHHHHHIIIHHHHHII")  # central directory entry (46 bytes)
+    _END     = struct.Struct("<IHHHHIIH")           # end of central directory (22 bytes)
+    _FLAGS   = 0x0008                               # sizes/CRC follow in a data descriptor
+
+    def __init__(self, persona: Persona, size: int, seed: str, chunk: int):
+        self.seed  = seed
+        self.chunk = chunk
+        self.time, self.date = _dos_datetime(datetime.fromisoformat(persona.last_deploy))
+        self.entries = self._plan(persona, size)
+        self.size = sum(
+            self._LOCAL.size + len(name) + length + self._DESC.size
+            + self._CENTRAL.size + len(name)
+            for name, length in self.entries
+        ) + self._END.size
+
+    def _plan(self, persona: Persona, size: int) -> list:
+        """Pick (name, length) pairs whose archive totals exactly ``size`` bytes."""
+        rng = random.Random(f"{self.seed}:zip")
+        stamp = f"{persona.last_year}0201"
+        entries, remaining = [], size - self._END.size
+        while True:
+            dept, name, _ = _document(rng, persona)
+            encoded = f"backup_{stamp}/{dept}/{len(entries):04d}_{name}".encode("utf-8")
+            overhead = self._LOCAL.size + self._DESC.size + self._CENTRAL.size + 2 * len(encoded)
+            if remaining - overhead <= 0:
+                break
+            length = min(rng.randint(64 * 1024, 8 * MB), remaining - overhead)
+            entries.append((encoded, length))
+            remaining -= overhead + length
+        if remaining and entries:                  # top up the last file to hit the size
+            name, length = entries[-1]
+            entries[-1] = (name, length + remaining)
+        return entries
+
+    def __iter__(self) -> Iterator[bytes]:
+        central, offset = [], 0
+        for name, length in self.entries:
+            header = self._LOCAL.pack(
+                0x04034B50, 20, self._FLAGS, 0, self.time, self.date,
+                0, 0, 0, len(name), 0,
+            ) + name
+            yield header
+            rng, crc, left = random.Random(f"{self.seed}:{name!r}"), 0, length
+            while left:
+                data = rng.randbytes(min(self.chunk, left))
+                crc = zlib.crc32(data, crc)
+                left -= len(data)
+                yield data
+            yield self._DESC.pack(0x08074B50, crc, length, length)
+            central.append((name, crc, length, offset))
+            offset += len(header) + length + self._DESC.size
+
+        cd_start, cd_size = offset, 0
+        for name, crc, length, local_offset in central:
+            record = self._CENTRAL.pack(
+                0x02014B50, 20, 20, self._FLAGS, 0, self.time, self.date,
+                crc, length, length, len(name), 0, 0, 0, 0, 0x20, local_offset,
+            ) + name
+            cd_size += len(record)
+            yield record
+        yield self._END.pack(0x06054B50, 0, 0, len(central), len(central), cd_size, cd_start, 0)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HTTP
+# ─────────────────────────────────────────────────────────────────────────────
+
+class BackupDownloads:
+    """Builds the (cheap, lazy) generators once; serves throttled streams."""
+
+    def __init__(self, settings: BackupSettings, persona: Persona):
+        self.settings = settings
+        self.persona  = persona
+        seed  = settings.seed or persona.server_name
+        chunk = settings.chunk_kb * 1024
+        self.sql = SqlDump(persona, settings.sql_bytes, seed, chunk)
+        self.zip = ZipArchive(persona, settings.zip_bytes, seed, chunk)
+        self.rate = settings.bandwidth_kbps * 1024
+        self.zip_filename = f"backup_{persona.last_year}0201.zip"     # as in the /backup/ listing
+
+    async def handle_sql(self, request: web.Request) -> web.StreamResponse:
+        return await self._stream(request, "sql", self.sql, "application/octet-stream",
+                                  "db_backup.sql")
+
+    async def handle_zip(self, request: web.Request) -> web.StreamResponse:
+        return await self._stream(request, "zip", self.zip, "application/zip",
+                                  self.zip_filename)
+
+    async def _stream(self, request, kind, source, content_type, filename) -> web.StreamResponse:
+        resp = web.StreamResponse(headers={
+            "Content-Type":        content_type,
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Last-Modified":       self.persona.http_last_modified,
+            "Accept-Ranges":       "none",
+        })
+        resp.content_length = source.size
+        await resp.prepare(request)
+        if request.method == "HEAD":
+            return resp
+
+        loop  = asyncio.get_running_loop()
+        start = loop.time()
+        sent  = 0
+        bytes_sent = BACKUP_BYTES.labels(kind)
+        BACKUP_STREAMS.inc()
+        try:
+            for chunk in source:
+                await resp.write(chunk)
+                sent += len(chunk)
+                bytes_sent.inc(len(chunk))
+                if self.rate:
+                    delay = start + sent / self.rate - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+            await resp.write_eof()
+        except ConnectionError:
+            pass                                   # attacker gave up — that's fine
+        finally:
+            BACKUP_STREAMS.dec()
+        return resp
@@ -0,0 +1,38 @@
+"""
+Command-line interface shared by ``main.py`` and ``python -m honeypot``.
+
+Usage:
+    python main.py [config.yaml] [--workers N]
+    python -m honeypot replay [--db PATH | --jsonl PATH] [...]   (see replay.py)
+"""
+
+import argparse
+import sys
+
+from .app import run
+
+# Subcommands, dispatched on the first argument; anything else starts the sensor
+COMMANDS = {"replay"}
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in COMMANDS:
+        from . import replay
+        sys.exit(replay.main(argv[1:]))
+
+    parser = argparse.ArgumentParser(
+        prog="honeypot",
+        description="Corporate web honeypot — insider threat / lateral movement detection",
+    )
+    parser.add_argument(
+        "config", nargs="?", default="config.yaml",
+        help="path to config.yaml (default: ./config.yaml)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, metavar="N",
+        help="fork N aiohttp workers sharing the port via SO_REUSEPORT "
+             "(default: server.workers, or 1)",
+    )
+    args = parser.parse_args(argv)
+    run(args.config, workers=args.workers)
@@ -0,0 +1,66 @@
+"""
+Per-request context — a single snapshot of everything the pipeline needs.
+
+Built once by the middleware and stored on the request under CONTEXT_KEY, so
+the fingerprinter, logger, alerter and route handlers all share the same
+header dict, parsed query/form and timestamp instead of each re-reading and
+re-parsing the request.  Plain data only, so it can be pickled across the
+worker → supervisor queue.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+from urllib.parse import parse_qs
+
+from aiohttp import web
+
+from .fingerprint import FingerprintResult
+
+CONTEXT_KEY = "hp_ctx"
+
+BODY_LIMIT = 4096          # bytes of body kept for logging (form is parsed from the full body)
+
+
+@dataclass
+class RequestContext:
+    source_ip: str
+    method: str
+    path: str
+    user_agent: str
+    headers: dict
+    query: dict
+    timestamp: str                          # ISO-8601 UTC, read once per request
+    body: str = ""                          # decoded body, capped at BODY_LIMIT
+    form: dict = field(default_factory=dict)    # first value per urlencoded field
+    fingerprint: Optional[FingerprintResult] = None
+    is_internal: bool = False               # set by HoneypotLogger.classify()
+    severity: str = "INFO"                  # set by HoneypotLogger.classify()
+
+    @classmethod
+    def from_request(cls, request: web.Request) -> "RequestContext":
+        headers   = request.headers
+        forwarded = headers.get("X-Forwarded-For", "")
+        source_ip = forwarded.split(",")[0].strip() if forwarded else (request.remote or "unknown")
+        return cls(
+            source_ip=source_ip,
+            method=request.method,
+            path=request.path,
+            user_agent=headers.get("User-Agent", ""),
+            headers=dict(headers),
+            query=dict(request.rel_url.query),
+            timestamp=datetime.utcnow().isoformat(),
+        )
+
+    async def read_body(self, request: web.Request) -> None:
+        """Read the body once; aiohttp caches it for any later request.text()."""
+        try:
+            text = await request.text()
+        except Exception:
+            text = ""
+        self.body = text[:BODY_LIMIT]
+        if text:
+            try:
+                self.form = {k: v[0] for k, v in parse_qs(text).items()}
+            except Exception:
+                self.form = {}
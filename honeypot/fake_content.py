@@ -4,81 +4,87 @@ All fake content served by the honeypot.
 Everything here is deliberately designed to look like a real legacy intranet
 server from ~2009-2013, leaking credentials and sensitive configuration.
 None of the passwords, IPs, or keys correspond to any real system.
+
+Names, versions, dates and planted credentials come from a Persona (see
+persona.py).  Everything here is rendered once per deployment by
+static_cache.py — never per request.
 """
 
-import json
+from .persona import Persona
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Fake static files
 # ─────────────────────────────────────────────────────────────────────────────
 
-FAKE_ENV = """\
+def get_env_file(p: Persona) -> str:
+    return f"""\
 APP_ENV=production
 APP_DEBUG=false
 APP_KEY=base64:K3d8pVqR7mN2xT9wL5sJ1cY6hF4aE0bI8gQnMpZs
 
 DB_CONNECTION=mysql
-DB_HOST=192.168.1.10
+DB_HOST={p.db_host}
 DB_PORT=3306
-DB_DATABASE=intranet_dms
-DB_USERNAME=dms_app
-DB_PASSWORD=Dms@2011!Prod#9x
+DB_DATABASE={p.db_name}
+DB_USERNAME={p.db_user}
+DB_PASSWORD={p.db_password}
 
 MAIL_DRIVER=smtp
-MAIL_HOST=mail.corp.local
+MAIL_HOST=mail.{p.domain}
 MAIL_PORT=587
-MAIL_USERNAME=noreply@corp.local
-MAIL_PASSWORD=M@ilP@ss2010!
+MAIL_USERNAME={p.email("noreply")}
+MAIL_PASSWORD={p.mail_password}
 
-REDIS_HOST=192.168.1.15
+REDIS_HOST={p.redis_host}
 REDIS_PORT=6379
 
-LDAP_HOST=192.168.1.5
+LDAP_HOST={p.ldap_host}
 LDAP_PORT=389
-LDAP_BIND_DN=cn=svc-dms,ou=service,dc=corp,dc=local
-LDAP_BIND_PASSWORD=LdapSvc!2009#Prod
+LDAP_BIND_DN=cn=svc-{p.app_short.lower()},ou=service,{p.base_dn}
+LDAP_BIND_PASSWORD={p.ldap_password}
 
 SECRET_KEY=7f4d2e9a1b8c3f6e5d4c2b1a9f8e7d6c5b4a3f2e
-ADMIN_EMAIL=admin@corp.local
-BACKUP_PATH=\\\\nas01\\backups\\intranet
+ADMIN_EMAIL={p.email(p.admin_user)}
+BACKUP_PATH=\\\\{p.nas_host}\\backups\\intranet
 API_SECRET=a1b2c3d4e5f6g7h8i9j0k1l2m3n4o5p6
 """
 
-FAKE_CONFIG_PHP = """\
+def get_config_php(p: Persona) -> str:
+    return f"""\
 <?php
 // Database Configuration
-// Last modified: 2012-11-03 by admin
+// Last modified: {p.last_year - 1}-11-03 by {p.admin_user}
 
-define('DB_HOST',     '192.168.1.10');
-define('DB_USER',     'dms_app');
-define('DB_PASS',     'Dms@2011!Prod#9x');
-define('DB_NAME',     'intranet_dms');
+define('DB_HOST',     '{p.db_host}');
+define('DB_USER',     '{p.db_user}');
+define('DB_PASS',     '{p.db_password}');
+define('DB_NAME',     '{p.db_name}');
 
 // Application Settings
-define('APP_NAME',    'Corporate Document Management System');
-define('APP_VERSION', '2.1.4');
+define('APP_NAME',    'Corporate {p.app_name}');
+define('APP_VERSION', '{p.app_version}');
 define('DEBUG_MODE',  false);
 define('SESSION_TIMEOUT', 3600);
 
 // File Storage
 define('UPLOAD_PATH', 'D:\\\\intranet\\\\uploads\\\\');
-define('BACKUP_PATH', '\\\\\\\\nas01\\\\backups\\\\intranet\\\\');
+define('BACKUP_PATH', '\\\\\\\\{p.nas_host}\\\\backups\\\\intranet\\\\');
 define('MAX_FILE_SIZE', 52428800);  // 50 MB
 
 // LDAP / Active Directory
-define('LDAP_SERVER',    '192.168.1.5');
+define('LDAP_SERVER',    '{p.ldap_host}');
 define('LDAP_PORT',       389);
-define('LDAP_BIND_USER', 'cn=svc-dms,ou=service,dc=corp,dc=local');
-define('LDAP_BIND_PASS', 'LdapSvc!2009#Prod');
-define('LDAP_BASE_DN',   'dc=corp,dc=local');
+define('LDAP_BIND_USER', 'cn=svc-{p.app_short.lower()},ou=service,{p.base_dn}');
+define('LDAP_BIND_PASS', '{p.ldap_password}');
+define('LDAP_BASE_DN',   '{p.base_dn}');
 
 // Email
-define('SMTP_HOST', 'mail.corp.local');
+define('SMTP_HOST', 'mail.{p.domain}');
 define('SMTP_PORT',  587);
-define('SMTP_USER', 'noreply@corp.local');
-define('SMTP_PASS', 'M@ilP@ss2010!');
-define('ADMIN_EMAIL', 'admin@corp.local');
+define('SMTP_USER', '{p.email("noreply")}');
+define('SMTP_PASS', '{p.mail_password}');
+define('ADMIN_EMAIL', '{p.email(p.admin_user)}');
 
 // Security
 define('ENCRYPTION_KEY', '7f4d2e9a1b8c3f6e5d4c2b1a9f8e7d6c');
@@ -89,12 +95,13 @@ define('REPORTING_API_KEY', 'a7f3c9e2b4d6f8a0c2e4b6d8f0a2c4e6');
 ?>
 """
 
-FAKE_SQL_DUMP = """\
+def get_sql_dump(p: Persona) -> str:
+    return f"""\
 -- MySQL dump 10.13  Distrib 5.1.73, for Win32 (ia32)
 --
--- Host: 192.168.1.10    Database: intranet_dms
+-- Host: {p.db_host}    Database: {p.db_name}
 -- Server version: 5.1.73
--- Generation Time: Feb 01, 2013 at 03:00 AM
+-- Generation Time: Feb 01, {p.last_year} at 03:00 AM
 
 /*!40101 SET NAMES utf8 */;
 /*!40014 SET FOREIGN_KEY_CHECKS=0 */;
@@ -117,11 +124,11 @@ CREATE TABLE `users` (
 ) ENGINE=InnoDB AUTO_INCREMENT=52 DEFAULT CHARSET=utf8;
 
 INSERT INTO `users` VALUES
-  (1,'admin',     '$apr1$Gh2k9lPq$X8mN3fK7wY5jT2sR1vD4e.','admin@corp.local','System Administrator','admin',  '2013-02-10 08:34:22','2009-03-15 08:00:00'),
-  (2,'jsmith',    '$apr1$Rt7p2mKl$N5qX8wF3sY1jT9vR2eD6b.','j.smith@corp.local','John Smith',         'manager','2013-02-09 17:12:01','2010-01-22 09:15:00'),
-  (3,'mjohnson',  '$apr1$Wq5n8kPr$L2xT7mF4sY0jK9vN3eD1a.','m.johnson@corp.local','Mary Johnson',     'user',   '2013-01-28 10:05:44','2010-03-10 11:30:00'),
-  (4,'bwilliams', '$apr1$Ym3p7nKs$T8qX2wF5sY6jN1vR4eD9c.','b.williams@corp.local','Bob Williams',    'admin',  '2013-02-08 14:20:33','2010-06-05 14:20:00'),
-  (5,'svc_backup','$apr1$Zn2q5mPt$R9xT3wF8sK4jL7vN0eD2b.','',                'Backup Service',       'viewer', '2013-02-01 03:00:00','2011-01-01 00:00:00');
+  (1,'{p.admin_user}',     '$apr1$Gh2k9lPq$X8mN3fK7wY5jT2sR1vD4e.','{p.email(p.admin_user)}','System Administrator','admin',  '{p.last_active} 08:34:22','{p.first_year}-03-15 08:00:00'),
+  (2,'jsmith',    '$apr1$Rt7p2mKl$N5qX8wF3sY1jT9vR2eD6b.','{p.email("j.smith")}','John Smith',         'manager','{p.last_year}-02-09 17:12:01','2010-01-22 09:15:00'),
+  (3,'mjohnson',  '$apr1$Wq5n8kPr$L2xT7mF4sY0jK9vN3eD1a.','{p.email("m.johnson")}','Mary Johnson',     'user',   '{p.last_year}-01-28 10:05:44','2010-03-10 11:30:00'),
+  (4,'bwilliams', '$apr1$Ym3p7nKs$T8qX2wF5sY6jN1vR4eD9c.','{p.email("b.williams")}','Bob Williams',    'admin',  '{p.last_year}-02-08 14:20:33','2010-06-05 14:20:00'),
+  (5,'svc_backup','$apr1$Zn2q5mPt$R9xT3wF8sK4jL7vN0eD2b.','',                'Backup Service',       'viewer', '{p.last_year}-02-01 03:00:00','2011-01-01 00:00:00');
 
 --
 -- Table structure for table `documents`
@@ -171,35 +178,39 @@ Disallow: /manager/
 Disallow: /uploads/
 """
 
-FAKE_API_USERS = [
-    {"id": 1, "username": "admin",      "email": "admin@corp.local",      "role": "admin",   "department": "IT",         "last_login": "2013-02-10T08:34:22Z"},
-    {"id": 2, "username": "jsmith",     "email": "j.smith@corp.local",    "role": "manager", "department": "Operations", "last_login": "2013-02-09T17:12:01Z"},
-    {"id": 3, "username": "mjohnson",   "email": "m.johnson@corp.local",  "role": "user",    "department": "HR",         "last_login": "2013-01-28T10:05:44Z"},
-    {"id": 4, "username": "bwilliams", "email": "b.williams@corp.local", "role": "admin",   "department": "Finance",    "last_login": "2013-02-08T14:20:33Z"},
-    {"id": 5, "username": "svc_backup", "email": "",                      "role": "viewer",  "department": "IT",         "last_login": "2013-02-01T03:00:00Z"},
-]
-
-FAKE_API_CONFIG = {
-    "version": "2.1.4",
-    "environment": "production",
-    "database": {
-        "host":     "192.168.1.10",
-        "port":     3306,
-        "name":     "intranet_dms",
-        "user":     "dms_app",
-        "password": "Dms@2011!Prod#9x",
-    },
-    "ldap": {
-        "server":        "192.168.1.5",
-        "bind_dn":       "cn=svc-dms,ou=service,dc=corp,dc=local",
-        "bind_password": "LdapSvc!2009#Prod",
-    },
-    "features": {
-        "document_versioning":  True,
-        "email_notifications":  True,
-        "audit_logging":        False,
-    },
-}
+def get_api_users(p: Persona) -> list:
+    y = p.last_year
+    return [
+        {"id": 1, "username": p.admin_user, "email": p.email(p.admin_user), "role": "admin",   "department": "IT",         "last_login": f"{p.last_active}T08:34:22Z"},
+        {"id": 2, "username": "jsmith",     "email": p.email("j.smith"),    "role": "manager", "department": "Operations", "last_login": f"{y}-02-09T17:12:01Z"},
+        {"id": 3, "username": "mjohnson",   "email": p.email("m.johnson"),  "role": "user",    "department": "HR",         "last_login": f"{y}-01-28T10:05:44Z"},
+        {"id": 4, "username": "bwilliams",  "email": p.email("b.williams"), "role": "admin",   "department": "Finance",    "last_login": f"{y}-02-08T14:20:33Z"},
+        {"id": 5, "username": "svc_backup", "email": "",                    "role": "viewer",  "department": "IT",         "last_login": f"{y}-02-01T03:00:00Z"},
+    ]
+
+
+def get_api_config(p: Persona) -> dict:
+    return {
+        "version": p.app_version,
+        "environment": "production",
+        "database": {
+            "host":     p.db_host,
+            "port":     3306,
+            "name":     p.db_name,
+            "user":     p.db_user,
+            "password": p.db_password,
+        },
+        "ldap": {
+            "server":        p.ldap_host,
+            "bind_dn":       f"cn=svc-{p.app_short.lower()},ou=service,{p.base_dn}",
+            "bind_password": p.ldap_password,
+        },
+        "features": {
+            "document_versioning":  True,
+            "email_notifications":  True,
+            "audit_logging":        False,
+        },
+    }
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -223,17 +234,17 @@ a { color: #003366; }
 """
 
 
-def get_index_html() -> str:
+def get_index_html(p: Persona) -> str:
     return f"""\
 <!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
 <html><head>
-<title>Corporate Intranet - Document Management System</title>
+<title>Corporate Intranet - {p.app_name}</title>
 <meta http-equiv="Content-Type" content="text/html; charset=utf-8">
 <style>{_BASE_CSS}</style>
 </head><body>
 <div class="hdr">
-  <h1>Corporate Intranet &mdash; Document Management System v2.1</h1>
-  <small>Server: CORP-INTRANET-OLD01 &nbsp;|&nbsp; Last system check: 2013-02-10</small>
+  <h1>Corporate Intranet &mdash; {p.app_name} v{p.app_major}</h1>
+  <small>Server: {p.server_name} &nbsp;|&nbsp; Last system check: {p.last_active}</small>
 </div>
 <div class="content">
 <table>
@@ -246,21 +257,21 @@ def get_index_html() -> str:
 <tr><td><a href="/.env">.env</a></td><td>2012-11-03 16:55</td><td>1.1 KB</td><td>Environment Variables</td></tr>
 <tr><td><a href="/phpmyadmin/">phpmyadmin</a></td><td>2010-04-22 08:00</td><td>&mdash;</td><td>Database Administration</td></tr>
 </table>
-<div class="ftr">&copy; 2009&ndash;2013 ACME Corporation. Internal use only.
-| IT Department | <a href="mailto:helpdesk@corp.local">helpdesk@corp.local</a></div>
+<div class="ftr">&copy; {p.years} {p.company}. Internal use only.
+| IT Department | <a href="mailto:{p.email("helpdesk")}">{p.email("helpdesk")}</a></div>
 </div>
 </body></html>
 """
 
 
-def get_admin_login_html(error: bool = False) -> str:
+def get_admin_login_html(p: Persona, error: bool = False) -> str:
     msg = ""
     if error:
         msg = '<div class="err">Invalid username or password. Please try again.</div>'
     return f"""\
 <!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
 <html><head>
-<title>Admin Login &mdash; Corporate DMS</title>
+<title>Admin Login &mdash; Corporate {p.app_short}</title>
 <style>
 body {{ font-family: Arial, sans-serif; background: #003366; }}
 .box {{ width: 360px; margin: 80px auto; background: #fff; padding: 28px 32px; border-radius: 3px; }}
@@ -279,7 +290,7 @@ small {{ display: block; text-align: center; color: #888; margin-top: 14px; font
 </style>
 </head><body>
 <div class="box">
-  <h2>Document Management System</h2>
+  <h2>{p.app_name}</h2>
   <h3>Administrator Login</h3>
   {msg}
   <form method="POST" action="/admin/login">
@@ -289,19 +300,19 @@ small {{ display: block; text-align: center; color: #888; margin-top: 14px; font
     <input type="password" name="password">
     <input type="submit" value="Login">
   </form>
-  <small>Corporate Intranet DMS v2.1 &copy; 2009&ndash;2013</small>
-  <small>Problems? <a href="mailto:helpdesk@corp.local">helpdesk@corp.local</a></small>
+  <small>Corporate Intranet {p.generator} &copy; {p.years}</small>
+  <small>Problems? <a href="mailto:{p.email("helpdesk")}">{p.email("helpdesk")}</a></small>
 </div>
 </body></html>
 """
 
 
-def get_admin_dashboard_html() -> str:
+def get_admin_dashboard_html(p: Persona) -> str:
     """Shown after any credential submission — maximises dwell time."""
     return f"""\
 <!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
 <html><head>
-<title>Admin Dashboard &mdash; Corporate DMS</title>
+<title>Admin Dashboard &mdash; Corporate {p.app_short}</title>
 <style>{_BASE_CSS}
 .stat {{ display:inline-block; background:#003366; color:#fff; padding:14px 22px;
          margin:6px; text-align:center; min-width:120px; }}
@@ -309,8 +320,8 @@ def get_admin_dashboard_html() -> str:
 </style>
 </head><body>
 <div class="hdr">
-  <h1>Admin Dashboard &mdash; Document Management System v2.1</h1>
-  <small>Logged in as: <b>admin</b> &nbsp;|&nbsp; CORP-INTRANET-OLD01</small>
+  <h1>Admin Dashboard &mdash; {p.app_name} v{p.app_major}</h1>
+  <small>Logged in as: <b>{p.admin_user}</b> &nbsp;|&nbsp; {p.server_name}</small>
 </div>
 <div class="content">
 <p>
@@ -331,74 +342,74 @@ def get_admin_dashboard_html() -> str:
 <h3>Recent Activity</h3>
 <table>
   <tr><th>Time</th><th>User</th><th>Action</th></tr>
-  <tr><td>2013-02-10 08:34</td><td>admin</td><td>Logged in</td></tr>
+  <tr><td>{p.last_active} 08:34</td><td>{p.admin_user}</td><td>Logged in</td></tr>
   <tr><td>2013-02-09 17:12</td><td>jsmith</td><td>Uploaded: Q4_Financial_Report_DRAFT.xlsx</td></tr>
   <tr><td>2013-02-09 14:05</td><td>bwilliams</td><td>Accessed: HR_Salary_2013.xlsx (CONFIDENTIAL)</td></tr>
   <tr><td>2013-02-08 11:30</td><td>mjohnson</td><td>Updated employee record: ID 2847</td></tr>
 </table>
-<div class="ftr">&copy; 2009&ndash;2013 ACME Corporation. Internal use only.</div>
+<div class="ftr">&copy; {p.years} {p.company}. Internal use only.</div>
 </div>
 </body></html>
 """
 
 
-def get_admin_users_html() -> str:
+def get_admin_users_html(p: Persona) -> str:
     return f"""\
 <!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
 <html><head>
-<title>User Management &mdash; Corporate DMS</title>
+<title>User Management &mdash; Corporate {p.app_short}</title>
 <style>{_BASE_CSS}</style>
 </head><body>
-<div class="hdr"><h1>User Management</h1><small>CORP-INTRANET-OLD01</small></div>
+<div class="hdr"><h1>User Management</h1><small>{p.server_name}</small></div>
 <div class="content">
 <table>
 <tr><th>ID</th><th>Username</th><th>Full Name</th><th>Email</th><th>Role</th><th>Last Login</th></tr>
-<tr><td>1</td><td>admin</td><td>System Administrator</td><td>admin@corp.local</td><td>admin</td><td>2013-02-10 08:34</td></tr>
-<tr><td>2</td><td>jsmith</td><td>John Smith</td><td>j.smith@corp.local</td><td>manager</td><td>2013-02-09 17:12</td></tr>
-<tr><td>3</td><td>mjohnson</td><td>Mary Johnson</td><td>m.johnson@corp.local</td><td>user</td><td>2013-01-28 10:05</td></tr>
-<tr><td>4</td><td>bwilliams</td><td>Bob Williams</td><td>b.williams@corp.local</td><td>admin</td><td>2013-02-08 14:20</td></tr>
+<tr><td>1</td><td>{p.admin_user}</td><td>System Administrator</td><td>{p.email(p.admin_user)}</td><td>admin</td><td>{p.last_active} 08:34</td></tr>
+<tr><td>2</td><td>jsmith</td><td>John Smith</td><td>{p.email("j.smith")}</td><td>manager</td><td>2013-02-09 17:12</td></tr>
+<tr><td>3</td><td>mjohnson</td><td>Mary Johnson</td><td>{p.email("m.johnson")}</td><td>user</td><td>2013-01-28 10:05</td></tr>
+<tr><td>4</td><td>bwilliams</td><td>Bob Williams</td><td>{p.email("b.williams")}</td><td>admin</td><td>2013-02-08 14:20</td></tr>
 <tr><td>5</td><td>svc_backup</td><td>Backup Service</td><td>&mdash;</td><td>viewer</td><td>2013-02-01 03:00</td></tr>
 </table>
-<div class="ftr">&copy; 2009&ndash;2013 ACME Corporation.</div>
+<div class="ftr">&copy; {p.years} {p.company}.</div>
 </div></body></html>
 """
 
 
-def get_backup_listing_html() -> str:
-    return """\
+def get_backup_listing_html(p: Persona, sql_size: str = "18M", zip_size: str = "142M") -> str:
+    return f"""\
 <!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
 <html><head>
-<title>Index of /backup &mdash; CORP-INTRANET-OLD01</title>
-<style>body{font-family:monospace;font-size:13px;padding:20px;} h1{font-size:16px;} a{color:#00c;} hr{border:1px solid #aaa;}</style>
+<title>Index of /backup &mdash; {p.server_name}</title>
+<style>body{{font-family:monospace;font-size:13px;padding:20px;}} h1{{font-size:16px;}} a{{color:#00c;}} hr{{border:1px solid #aaa;}}</style>
 </head><body>
 <h1>Index of /backup</h1>
 <pre>
       <a href="?C=N&amp;O=D">Name</a>                            <a href="?C=M&amp;O=A">Last modified</a>       <a href="?C=S&amp;O=A">Size</a>
 <hr>
       <a href="/">[Parent Directory]</a>                              -
-      <a href="/db_backup.sql">db_backup.sql</a>                   2013-02-01 03:00   18M
-      <a href="/backup.zip">backup_20130201.zip</a>             2013-02-01 03:15  142M
+      <a href="/db_backup.sql">db_backup.sql</a>                   {p.last_year}-02-01 03:00 {sql_size:>5}
+      <a href="/backup.zip">backup_{p.last_year}0201.zip</a>             {p.last_year}-02-01 03:15 {zip_size:>5}
       backup_20130101/                2013-01-01 03:00    -
       backup_20121201/                2012-12-01 03:00    -
       <a href="#">configs_20121103.tar.gz</a>         2012-11-03 16:55  2.4M
 <hr></pre>
-<address>Apache/2.2.14 (Win32) Server at CORP-INTRANET-OLD01 Port 80</address>
+<address>{p.server_header} Server at {p.server_name} Port {p.port}</address>
 </body></html>
 """
 
 
-def get_phpmyadmin_html() -> str:
-    return """\
+def get_phpmyadmin_html(p: Persona) -> str:
+    return f"""\
 <!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
 <html><head>
 <title>phpMyAdmin 3.3.10.4</title>
 <style>
-body{font-family:sans-serif;background:#d0d0d0;}
-.box{background:#fff;width:380px;margin:60px auto;padding:22px;border:1px solid #bbb;}
-label{font-size:12px;display:block;margin-bottom:2px;}
-input{width:100%;padding:5px;margin-bottom:12px;box-sizing:border-box;border:1px solid #aaa;}
-input[type=submit]{background:#4a6984;color:#fff;border:none;cursor:pointer;padding:7px;}
-small{font-size:11px;color:#666;}
+body{{font-family:sans-serif;background:#d0d0d0;}}
+.box{{background:#fff;width:380px;margin:60px auto;padding:22px;border:1px solid #bbb;}}
+label{{font-size:12px;display:block;margin-bottom:2px;}}
+input{{width:100%;padding:5px;margin-bottom:12px;box-sizing:border-box;border:1px solid #aaa;}}
+input[type=submit]{{background:#4a6984;color:#fff;border:none;cursor:pointer;padding:7px;}}
+small{{font-size:11px;color:#666;}}
 </style>
 </head><body>
 <div class="box">
@@ -407,16 +418,16 @@ small{font-size:11px;color:#666;}
     <input type="hidden" name="token" value="374e19b22f0ec6d3a0a6f1b2b44aa2c9">
     <label>Username:</label><input type="text" name="pma_username">
     <label>Password:</label><input type="password" name="pma_password">
-    <label>Server:</label><input type="text" name="server" value="192.168.1.10">
+    <label>Server:</label><input type="text" name="server" value="{p.db_host}">
     <input type="submit" value="Go">
   </form>
-  <br><small>phpMyAdmin 3.3.10.4 &nbsp;|&nbsp; MySQL: 5.1.73 &nbsp;|&nbsp; PHP: 5.2.17</small>
+  <br><small>phpMyAdmin 3.3.10.4 &nbsp;|&nbsp; MySQL: 5.1.73 &nbsp;|&nbsp; PHP: {p.powered_by.partition("/")[2] or p.powered_by}</small>
 </div>
 </body></html>
 """
 
 
-def get_tomcat_html() -> str:
+def get_tomcat_html(p: Persona) -> str:
     return """\
 <!DOCTYPE html>
 <html><head><title>401 Unauthorized</title></head>
@@ -432,7 +443,7 @@ def get_tomcat_html() -> str:
 """
 
 
-def get_404_html(path: str) -> str:
+def get_404_html(p: Persona, path: str) -> str:
     return f"""\
 <!DOCTYPE HTML PUBLIC "-//IETF//DTD HTML 2.0//EN">
 <html><head><title>404 Not Found</title></head>
@@ -440,6 +451,6 @@ def get_404_html(path: str) -> str:
 <h1>Not Found</h1>
 <p>The requested URL {path} was not found on this server.</p>
 <hr>
-<address>Apache/2.2.14 (Win32) Server at CORP-INTRANET-OLD01 Port 80</address>
+<address>{p.server_header} Server at {p.server_name} Port {p.port}</address>
 </body></html>
 """
@@ -3,8 +3,26 @@ Structured logging to SQLite + rotating log file.
 
 Schema
 ------
-requests  — one row per HTTP request, including fingerprint data
-alerts    — one row per alert dispatched to SOC
+requests            — one row per HTTP request, including fingerprint data
+request_aggregates  — per-bucket counts of folded external noise (see below)
+alerts              — one row per alert dispatched to SOC
+
+Rows are serialised and inserted by a background writer thread in batched
+transactions, so the event loop never waits on json.dumps or a SQLite commit.
+
+Traffic policy (``logging.external_policy``) — internal traffic and anything
+HIGH/CRITICAL is always logged in full.  External INFO/MEDIUM traffic is:
+
+  full       logged in full (default)
+  sample     logged 1-in-``sample_rate``; kept rows carry ``sample_weight``
+             so SUM(sample_weight) estimates the true volume
+  aggregate  folded into ``request_aggregates`` — one counter per
+             (time bucket, IP, path, scanner)
+
+Retry storms (``logging.dedup_window``) — identical requests (same IP, method,
+path, query, headers and body) seen within the window are written once, with
+``repeat_count`` and ``last_seen`` covering every repeat.  True totals are
+SUM(repeat_count * sample_weight); use ``count_requests()``.
 
 Internal IPs are flagged automatically based on the configured CIDR ranges.
 Severity is assigned as follows:
@@ -15,27 +33,252 @@ Severity is assigned as follows:
   INFO      all other traffic
 """
 
+import atexit
+import hashlib
 import ipaddress
 import json
 import logging
+import queue
 import sqlite3
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
+from time import monotonic, perf_counter
 from typing import Optional
 
+from .metrics import DB_QUEUE_DEPTH, DB_ROWS, REQUESTS, REQUESTS_DEDUPED, REQUESTS_FOLDED, STAGE
+
 logger = logging.getLogger("honeypot")
 
 SEVERITY_RANK = {"INFO": 0, "MEDIUM": 1, "HIGH": 2, "CRITICAL": 3}
 
+EXTERNAL_POLICIES = ("full", "sample", "aggregate")
+
+# SQL expression for the number of real requests a requests row stands for
+TRUE_COUNT = "repeat_count * sample_weight"
+
+_INSERT_REQUEST = """INSERT INTO requests
+   (timestamp, source_ip, method, path, query_params, headers, body,
+    is_internal, scanner_type, suspicious_path, attack_in_headers,
+    severity, fingerprint_details, tags, sample_weight, repeat_count, last_seen)
+   VALUES
+   (:timestamp, :source_ip, :method, :path, :query_params, :headers, :body,
+    :is_internal, :scanner_type, :suspicious_path, :attack_in_headers,
+    :severity, :fingerprint_details, :tags, :sample_weight, :repeat_count, :last_seen)"""
+
+_UPSERT_AGGREGATE = """INSERT INTO request_aggregates
+   (bucket, source_ip, path, scanner_type, severity, count, first_seen, last_seen)
+   VALUES (?,?,?,?,?,?,?,?)
+   ON CONFLICT (bucket, source_ip, path, scanner_type) DO UPDATE SET
+    count     = count + excluded.count,
+    first_seen = MIN(first_seen, excluded.first_seen),
+    last_seen  = MAX(last_seen, excluded.last_seen)"""
+
+_INSERT_ALERT = """INSERT INTO alerts
+   (timestamp, source_ip, alert_type, severity,
+    endpoints_accessed, scanner_type, details)
+   VALUES (?,?,?,?,?,?,?)"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Classification (also used offline by replay.py)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def parse_internal_ranges(ranges) -> list:
+    return [ipaddress.ip_network(r, strict=False) for r in ranges]
+
+
+def is_internal_ip(ip: str, networks: list) -> bool:
+    try:
+        addr = ipaddress.ip_address(ip)
+        return any(addr in net for net in networks)
+    except ValueError:
+        return False
+
+
+def classify_severity(
+    is_internal: bool,
+    method: str,
+    scanner_name: Optional[str],
+) -> str:
+    if is_internal and scanner_name:
+        return "CRITICAL"
+    if is_internal:
+        return "HIGH"
+    if scanner_name:
+        return "MEDIUM"
+    return "INFO"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Background writer
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _BatchWriter(threading.Thread):
+    """
+    Owns the only write connection.  Drains the queue in batches, does the
+    JSON serialisation off the event loop and commits each batch in a single
+    transaction.
+
+    With a dedup window, request rows are held in ``_open`` (keyed by a digest
+    of the request) until the window closes; repeats only bump the held row.
+    A ``("flush", None)`` item closes every open window immediately.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        aggregate_bucket: int = 60,
+        dedup_window: float = 0.0,
+        dedup_max_open: int = 10_000,
+    ):
+        super().__init__(name="honeypot-db-writer", daemon=True)
+        self.db_path          = db_path
+        self.batch_size       = batch_size
+        self.flush_interval   = flush_interval
+        self.aggregate_bucket = aggregate_bucket
+        self.dedup_window     = dedup_window
+        self.dedup_max_open   = dedup_max_open
+        self.queue: "queue.Queue" = queue.Queue()
+        self._open: "OrderedDict[bytes, tuple]" = OrderedDict()    # digest → (opened, row)
+
+    def run(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if not self._open:
+                    continue
+                batch = []
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            requests, alerts, aggregates = [], [], {}
+            close_all = False
+            for item in batch:
+                if item is None:
+                    stopping = close_all = True
+                elif item[0] == "request":
+                    self._dedup(self._serialise(item[1]), requests)
+                elif item[0] == "aggregate":
+                    self._fold(aggregates, item[1])
+                elif item[0] == "flush":
+                    close_all = True
+                else:
+                    alerts.append(item[1])
+            self._close_windows(requests, close_all)
+            if not (requests or alerts or aggregates):
+                for _ in batch:
+                    self.queue.task_done()
+                continue
+            try:
+                t0 = perf_counter()
+                with conn:
+                    if requests:
+                        conn.executemany(_INSERT_REQUEST, requests)
+                    if alerts:
+                        conn.executemany(_INSERT_ALERT, alerts)
+                    if aggregates:
+                        conn.executemany(_UPSERT_AGGREGATE, [
+                            (*key, *value) for key, value in aggregates.items()
+                        ])
+                STAGE["db_insert"].observe(perf_counter() - t0)
+                DB_ROWS.labels("requests").inc(len(requests))
+                DB_ROWS.labels("alerts").inc(len(alerts))
+                DB_ROWS.labels("request_aggregates").inc(len(aggregates))
+            except sqlite3.Error as exc:
+                logger.error(f"DB write failed, {len(batch)} item(s) lost: {exc}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+        conn.close()
+
+    def _dedup(self, row: dict, out: list) -> None:
+        """Open a window for ``row`` or count it as a repeat of an open one."""
+        if self.dedup_window <= 0:
+            out.append(row)
+            return
+        digest = hashlib.blake2b(
+            "\0".join((row["source_ip"], row["method"], row["path"],
+                       row["query_params"], row["headers"], row["body"] or "")).encode(),
+            digest_size=16,
+        ).digest()
+        held = self._open.get(digest)
+        if held is not None:
+            held[1]["repeat_count"] += 1
+            held[1]["last_seen"] = row["timestamp"]
+            REQUESTS_DEDUPED.inc()
+            return
+        self._open[digest] = (monotonic(), row)
+        if len(self._open) > self.dedup_max_open:
+            out.append(self._open.popitem(last=False)[1][1])
+
+    def _close_windows(self, out: list, close_all: bool) -> None:
+        """Move rows whose window has elapsed (or all of them) to ``out``."""
+        deadline = monotonic() - self.dedup_window
+        while self._open:
+            digest, (opened, row) = next(iter(self._open.items()))
+            if not close_all and opened > deadline:
+                break
+            del self._open[digest]
+            out.append(row)
+
+    def _fold(self, aggregates: dict, item: tuple) -> None:
+        """Count one folded request into this batch's (bucket, ip, path, scanner) totals."""
+        timestamp, source_ip, path, scanner, severity = item
+        epoch  = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+        start  = int(epoch // self.aggregate_bucket * self.aggregate_bucket)
+        bucket = datetime.fromtimestamp(start, timezone.utc).replace(tzinfo=None).isoformat()
+        key    = (bucket, source_ip, path, scanner or "")
+        entry  = aggregates.get(key)
+        if entry is None:
+            aggregates[key] = [severity, 1, timestamp, timestamp]
+        else:
+            entry[1] += 1
+            entry[3]  = timestamp
+
+    @staticmethod
+    def _serialise(record: dict) -> dict:
+        row = dict(record)
+        row["query_params"] = json.dumps(record["query_params"])
+        row["headers"]      = json.dumps(record["headers"])
+        row["tags"]         = json.dumps(record["tags"])
+        row["repeat_count"] = 1
+        row["last_seen"]    = record["timestamp"]
+        return row
+
+
+def _ensure_columns(conn: sqlite3.Connection, table: str, columns: dict) -> None:
+    """Add columns introduced after a DB was created (SQLite has no ADD COLUMN IF NOT EXISTS)."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
 
 class HoneypotLogger:
     def __init__(self, config: dict):
-        self.db_path  = config["logging"]["db_path"]
-        self.log_file = config["logging"]["log_file"]
-        self._internal_networks = [
-            ipaddress.ip_network(r, strict=False)
-            for r in config["internal_ranges"]
-        ]
+        log_cfg = config["logging"]
+        self.db_path  = log_cfg["db_path"]
+        self.log_file = log_cfg["log_file"]
+        self._internal_networks = parse_internal_ranges(config["internal_ranges"])
+
+        self.external_policy = log_cfg.get("external_policy", "full")
+        if self.external_policy not in EXTERNAL_POLICIES:
+            raise ValueError(
+                f"logging.external_policy must be one of {', '.join(EXTERNAL_POLICIES)}"
+            )
+        self.sample_rate  = max(1, int(log_cfg.get("sample_rate", 100)))
+        self._sample_tick = 0
 
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         Path(self.log_file).parent.mkdir(parents=True, exist_ok=True)
@@ -43,6 +286,25 @@ class HoneypotLogger:
         self._setup_file_logger()
         self._init_db()
 
+        # IPs already known to have rows — avoids a DB lookup per request for
+        # first-contact detection.  Bounded LRU; a miss falls back to the DB.
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._seen_max = int(log_cfg.get("seen_cache_size", 100_000))
+
+        self._read_conn = self._conn()
+        self._writer = _BatchWriter(
+            self.db_path,
+            batch_size=int(log_cfg.get("batch_size", 500)),
+            flush_interval=float(log_cfg.get("flush_interval", 0.5)),
+            aggregate_bucket=max(1, int(log_cfg.get("aggregate_bucket", 60))),
+            dedup_window=float(log_cfg.get("dedup_window", 10)),
+            dedup_max_open=int(log_cfg.get("dedup_max_open", 10_000)),
+        )
+        self._writer.start()
+        DB_QUEUE_DEPTH.set_function(self._writer.queue.qsize)
+        self._closed = False
+        atexit.register(self.close)
+
     # ── Setup ─────────────────────────────────────────────────────────────────
 
     def _setup_file_logger(self) -> None:
@@ -60,6 +322,7 @@ class HoneypotLogger:
 
     def _init_db(self) -> None:
         with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")   # readers don't block the writer
             conn.executescript("""
                 CREATE TABLE IF NOT EXISTS requests (
                     id                  INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -76,7 +339,22 @@ class HoneypotLogger:
                     attack_in_headers   INTEGER DEFAULT 0,
                     severity            TEXT    DEFAULT 'INFO',
                     fingerprint_details TEXT,
-                    tags                TEXT
+                    tags                TEXT,
+                    sample_weight       INTEGER DEFAULT 1,
+                    repeat_count        INTEGER DEFAULT 1,
+                    last_seen           TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS request_aggregates (
+                    bucket       TEXT    NOT NULL,
+                    source_ip    TEXT    NOT NULL,
+                    path         TEXT    NOT NULL,
+                    scanner_type TEXT    NOT NULL DEFAULT '',
+                    severity     TEXT    NOT NULL,
+                    count        INTEGER NOT NULL,
+                    first_seen   TEXT    NOT NULL,
+                    last_seen    TEXT    NOT NULL,
+                    PRIMARY KEY (bucket, source_ip, path, scanner_type)
                 );
 
                 CREATE TABLE IF NOT EXISTS alerts (
@@ -94,7 +372,13 @@ class HoneypotLogger:
                 CREATE INDEX IF NOT EXISTS idx_req_ts        ON requests(timestamp);
                 CREATE INDEX IF NOT EXISTS idx_req_severity  ON requests(severity);
                 CREATE INDEX IF NOT EXISTS idx_alert_ip      ON alerts(source_ip);
+                CREATE INDEX IF NOT EXISTS idx_agg_ip        ON request_aggregates(source_ip);
             """)
+            _ensure_columns(conn, "requests", {
+                "sample_weight": "INTEGER DEFAULT 1",
+                "repeat_count":  "INTEGER DEFAULT 1",
+                "last_seen":     "TEXT",
+            })
 
     # ── Helpers ───────────────────────────────────────────────────────────────
 
@@ -104,11 +388,7 @@ class HoneypotLogger:
         return conn
 
     def is_internal(self, ip: str) -> bool:
-        try:
-            addr = ipaddress.ip_address(ip)
-            return any(addr in net for net in self._internal_networks)
-        except ValueError:
-            return False
+        return is_internal_ip(ip, self._internal_networks)
 
     def _severity(
         self,
@@ -116,64 +396,65 @@ class HoneypotLogger:
         method: str,
         scanner_name: Optional[str],
     ) -> str:
-        if is_internal and scanner_name:
-            return "CRITICAL"
-        if is_internal:
-            return "HIGH"
-        if scanner_name:
-            return "MEDIUM"
-        return "INFO"
+        return classify_severity(is_internal, method, scanner_name)
+
+    def classify(self, ctx) -> None:
+        """Set ctx.is_internal and ctx.severity."""
+        ctx.is_internal = self.is_internal(ctx.source_ip)
+        scanner = ctx.fingerprint.scanner_name if ctx.fingerprint else None
+        ctx.severity = self._severity(ctx.is_internal, ctx.method, scanner)
+
+    def _first_contact(self, source_ip: str) -> bool:
+        seen = self._seen
+        if source_ip in seen:
+            seen.move_to_end(source_ip)
+            return False
+        seen[source_ip] = None
+        if len(seen) > self._seen_max:
+            seen.popitem(last=False)
+        with STAGE["first_contact"].time():
+            row = self._read_conn.execute(
+                "SELECT 1 FROM requests WHERE source_ip = ? LIMIT 1", (source_ip,)
+            ).fetchone()
+        return row is None
 
     # ── Public API ────────────────────────────────────────────────────────────
 
-    def log_request(
-        self,
-        source_ip: str,
-        method: str,
-        path: str,
-        query_params: dict,
-        headers: dict,
-        body: str,
-        fingerprint_result,           # FingerprintResult | None
-    ) -> dict:
-        """Insert one request row and return the full record dict."""
-        timestamp   = datetime.utcnow().isoformat()
-        internal    = self.is_internal(source_ip)
-        scanner     = fingerprint_result.scanner_name if fingerprint_result else None
-        severity    = self._severity(internal, method, scanner)
+    def log_request(self, ctx) -> dict:
+        """
+        Classify the request, queue its row for the background writer and
+        return the record dict.  ``record["first_contact"]`` is True when this
+        is the first request ever seen from the source IP.
+        """
+        self.classify(ctx)
+        fp       = ctx.fingerprint
+        internal = ctx.is_internal
+        severity = ctx.severity
+        scanner  = fp.scanner_name if fp else None
 
         record = {
-            "timestamp":           timestamp,
-            "source_ip":           source_ip,
-            "method":              method,
-            "path":                path,
-            "query_params":        json.dumps(query_params),
-            "headers":             json.dumps(headers),
-            "body":                (body or "")[:4096],   # cap at 4 KB
+            "timestamp":           ctx.timestamp,
+            "source_ip":           ctx.source_ip,
+            "method":              ctx.method,
+            "path":                ctx.path,
+            "query_params":        ctx.query,       # serialised by the writer
+            "headers":             ctx.headers,     # serialised by the writer
+            "body":                ctx.body,        # already capped at 4 KB
             "is_internal":         1 if internal else 0,
             "scanner_type":        scanner,
-            "suspicious_path":     1 if (fingerprint_result and fingerprint_result.suspicious_path) else 0,
-            "attack_in_headers":   1 if (fingerprint_result and fingerprint_result.attack_in_headers) else 0,
+            "suspicious_path":     1 if (fp and fp.suspicious_path) else 0,
+            "attack_in_headers":   1 if (fp and fp.attack_in_headers) else 0,
             "severity":            severity,
-            "fingerprint_details": fingerprint_result.details if fingerprint_result else "",
-            "tags":                json.dumps(fingerprint_result.tags if fingerprint_result else []),
+            "fingerprint_details": fp.details if fp else "",
+            "tags":                fp.tags if fp else [],
+            "sample_weight":       1,
+            "first_contact":       self._first_contact(ctx.source_ip),
         }
-
-        with self._conn() as conn:
-            conn.execute(
-                """INSERT INTO requests
-                   (timestamp, source_ip, method, path, query_params, headers, body,
-                    is_internal, scanner_type, suspicious_path, attack_in_headers,
-                    severity, fingerprint_details, tags)
-                   VALUES
-                   (:timestamp, :source_ip, :method, :path, :query_params, :headers, :body,
-                    :is_internal, :scanner_type, :suspicious_path, :attack_in_headers,
-                    :severity, :fingerprint_details, :tags)""",
-                record,
-            )
+        self._enqueue(record, internal, severity, scanner)
+        REQUESTS.labels(severity, scanner or "none").inc()
 
         tag   = "INTERNAL" if internal else "external"
-        label = f"[{severity}] {source_ip} ({tag}) {method} {path}"
+        label = f"[{severity}] {ctx.source_ip} ({tag}) {ctx.method} {ctx.path}"
         if scanner:
             label += f" [scanner={scanner}]"
 
@@ -182,6 +463,26 @@ class HoneypotLogger:
 
         return record
 
+    def _enqueue(self, record: dict, internal: bool, severity: str, scanner) -> None:
+        """Apply the external traffic policy and hand the row to the writer."""
+        policy = self.external_policy
+        if policy == "full" or internal or SEVERITY_RANK[severity] >= SEVERITY_RANK["HIGH"]:
+            self._writer.queue.put(("request", record))
+        elif policy == "sample":
+            keep = self._sample_tick == 0
+            self._sample_tick = (self._sample_tick + 1) % self.sample_rate
+            if keep:
+                record["sample_weight"] = self.sample_rate
+                self._writer.queue.put(("request", record))
+            else:
+                REQUESTS_FOLDED.labels("sample").inc()
+        else:
+            self._writer.queue.put((
+                "aggregate",
+                (record["timestamp"], record["source_ip"], record["path"], scanner, severity),
+            ))
+            REQUESTS_FOLDED.labels("aggregate").inc()
+
     def log_alert(
         self,
         source_ip: str,
@@ -190,36 +491,43 @@ class HoneypotLogger:
         endpoints: list,
         scanner_type: Optional[str],
         details: str,
+        timestamp: str,
     ) -> None:
-        timestamp = datetime.utcnow().isoformat()
-        with self._conn() as conn:
-            conn.execute(
-                """INSERT INTO alerts
-                   (timestamp, source_ip, alert_type, severity,
-                    endpoints_accessed, scanner_type, details)
-                   VALUES (?,?,?,?,?,?,?)""",
-                (timestamp, source_ip, alert_type, severity,
-                 json.dumps(endpoints), scanner_type, details),
-            )
+        self._writer.queue.put((
+            "alert",
+            (timestamp, source_ip, alert_type, severity,
+             json.dumps(endpoints), scanner_type, details),
+        ))
         logger.warning(f"ALERT [{severity}] {alert_type} — {source_ip}")
 
-    def is_first_contact(self, source_ip: str) -> bool:
-        """True only if this IP has exactly ONE request in the DB (just logged)."""
-        with self._conn() as conn:
-            row = conn.execute(
-                "SELECT COUNT(*) FROM requests WHERE source_ip = ?", (source_ip,)
-            ).fetchone()
-        return row[0] == 1
+    def flush(self) -> None:
+        """Block until every queued row, including open dedup windows, is committed."""
+        self._writer.queue.put(("flush", None))
+        self._writer.queue.join()
+
+    def close(self) -> None:
+        """Flush and stop the background writer (idempotent)."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writer.queue.put(None)
+        self._writer.join()
 
     def get_ip_history(self, source_ip: str) -> dict:
-        """Return a summary dict for a given source IP."""
-        with self._conn() as conn:
-            rows = conn.execute(
-                """SELECT method, path, timestamp, severity
-                   FROM requests WHERE source_ip = ?
-                   ORDER BY timestamp DESC LIMIT 100""",
-                (source_ip,),
-            ).fetchall()
+        """
+        Return a summary dict for a given source IP.  Flushes the writer first
+        so the just-logged request is included — only used on the (deduped)
+        alert path.
+        """
+        self.flush()
+        rows = self._read_conn.execute(
+            f"""SELECT method, path, timestamp, severity,
+                      COALESCE(last_seen, timestamp) AS last_seen,
+                      {TRUE_COUNT} AS hits
+               FROM requests WHERE source_ip = ?
+               ORDER BY timestamp DESC LIMIT 100""",
+            (source_ip,),
+        ).fetchall()
 
         if not rows:
             return {"total_requests": 0, "endpoints": [], "first_seen": None,
@@ -230,9 +538,33 @@ class HoneypotLogger:
         max_sev = max(severities, key=lambda s: SEVERITY_RANK.get(s, 0))
 
         return {
-            "total_requests": len(rows),
+            "total_requests": sum(r["hits"] for r in rows),
             "endpoints":      endpoints,
             "first_seen":     rows[-1]["timestamp"],
-            "last_seen":      rows[0]["timestamp"],
+            "last_seen":      max(r["last_seen"] for r in rows),
             "max_severity":   max_sev,
         }
+
+    def count_requests(self, source_ip: Optional[str] = None, since: Optional[str] = None) -> int:
+        """
+        True number of requests received (optionally from one IP / since an ISO
+        timestamp), counting dedup repeats, sample weights and aggregate buckets.
+        """
+        self.flush()
+        where, params = [], []
+        if source_ip:
+            where.append("source_ip = ?")
+            params.append(source_ip)
+        if since:
+            where.append("COALESCE(last_seen, timestamp) >= ?")
+            params.append(since)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        full = self._read_conn.execute(
+            f"SELECT COALESCE(SUM({TRUE_COUNT}), 0) FROM requests {clause}", params,
+        ).fetchone()[0]
+        folded = self._read_conn.execute(
+            f"SELECT COALESCE(SUM(count), 0) FROM request_aggregates "
+            f"{clause.replace('COALESCE(last_seen, timestamp)', 'last_seen')}",
+            params,
+        ).fetchone()[0]
+        return full + folded
@@ -0,0 +1,315 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+A deliberately tiny implementation (no client library dependency): counters,
+gauges and fixed-bucket histograms keyed by a label tuple.  Recording is a
+dict lookup plus an integer add (histograms add a bisect), cheap enough to stay
+on in production.  Hot paths should bind label values once via ``labels()``
+and keep the returned child.
+
+The metrics are served by the admin app (admin.py) on its own bind address —
+never on the bait port.  In worker mode each worker periodically ships a
+``snapshot()`` to the supervisor, which merges them into its own exposition.
+"""
+
+import bisect
+import time
+from typing import Callable, Optional
+
+# Latency buckets in seconds — 50 µs … 30 s covers a regex pass up to a tarpit sleep
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _fmt_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Metric types
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name       = name
+        self.help       = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: dict = {}
+
+    def _init_unlabelled(self) -> None:
+        if not self.labelnames:
+            self.labels()              # expose unlabelled metrics as 0 from the start
+
+    def labels(self, *values):
+        key = tuple("" if v is None else str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+    _new_child = _CounterChild
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Sample ``fn()`` at scrape time instead of tracking a value."""
+        self.function = fn
+
+    def get(self) -> float:
+        return float(self.function()) if self.function else self.value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+    _new_child = _GaugeChild
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self.labels().set_function(fn)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)      # last slot = +Inf
+        self.sum    = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Registry
+# ─────────────────────────────────────────────────────────────────────────────
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        metric._init_unlabelled()
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def snapshot(self) -> dict:
+        """Plain-data copy of every value — picklable, mergeable."""
+        snap = {}
+        for name, metric in self._metrics.items():
+            values = {}
+            for key, child in metric._children.items():
+                if metric.kind == "histogram":
+                    values[key] = (list(child.counts), child.sum)
+                elif metric.kind == "gauge":
+                    values[key] = child.get()
+                else:
+                    values[key] = child.value
+            snap[name] = values
+        return snap
+
+    def render(self, extra_snapshots=()) -> str:
+        """Prometheus text format; ``extra_snapshots`` (e.g. workers) are summed in."""
+        merged = self.snapshot()
+        for snap in extra_snapshots:
+            for name, values in snap.items():
+                target = merged.setdefault(name, {})
+                for key, value in values.items():
+                    if key not in target:
+                        target[key] = value
+                    elif isinstance(value, tuple):
+                        counts, total = target[key]
+                        target[key] = ([a + b for a, b in zip(counts, value[0])], total + value[1])
+                    else:
+                        target[key] = target[key] + value
+
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(merged.get(name, {}).items()):
+                if metric.kind != "histogram":
+                    lines.append(f"{name}{_fmt_labels(metric.labelnames, key)} {_fmt_value(value)}")
+                    continue
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    labels = _fmt_labels(metric.labelnames, key, f'le="{le}"')
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                labels = _fmt_labels(metric.labelnames, key)
+                lines.append(f"{name}_sum{labels} {_fmt_value(total)}")
+                lines.append(f"{name}_count{labels} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Honeypot metrics
+# ─────────────────────────────────────────────────────────────────────────────
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "honeypot_stage_seconds",
+    "Time spent in each request pipeline stage",
+    ["stage"],
+)
+REQUESTS = REGISTRY.counter(
+    "honeypot_requests_total",
+    "Requests logged, by severity and detected scanner",
+    ["severity", "scanner"],
+)
+TARPIT_HELD = REGISTRY.gauge(
+    "honeypot_tarpit_held_connections",
+    "Connections currently sleeping in the tarpit",
+)
+BACKUP_STREAMS = REGISTRY.gauge(
+    "honeypot_backup_downloads_active",
+    "Fake backup downloads currently streaming",
+)
+BACKUP_BYTES = REGISTRY.counter(
+    "honeypot_backup_bytes_sent_total",
+    "Bytes of fake backup streamed, by file",
+    ["file"],
+)
+REQUESTS_FOLDED = REGISTRY.counter(
+    "honeypot_requests_folded_total",
+    "External INFO/MEDIUM requests not stored as full rows, by traffic policy",
+    ["policy"],
+)
+REQUESTS_DEDUPED = REGISTRY.counter(
+    "honeypot_requests_deduplicated_total",
+    "Repeats folded into an already-open row by the dedup window",
+)
+DB_QUEUE_DEPTH = REGISTRY.gauge(
+    "honeypot_db_queue_depth",
+    "Rows waiting for the background DB writer",
+)
+DB_ROWS = REGISTRY.counter(
+    "honeypot_db_rows_written_total",
+    "Rows committed by the background DB writer",
+    ["table"],
+)
+ALERTS = REGISTRY.counter(
+    "honeypot_alerts_total",
+    "Alert deliveries by channel and outcome",
+    ["channel", "outcome"],
+)
+ALERT_SEND_SECONDS = REGISTRY.histogram(
+    "honeypot_alert_send_seconds",
+    "Alert delivery latency by channel",
+    ["channel"],
+)
+FORWARD_DROPPED = REGISTRY.counter(
+    "honeypot_forward_dropped_total",
+    "Requests a worker dropped because the writer queue was full",
+)
+
+# Pre-bound children for the per-request hot path
+STAGE = {
+    stage: STAGE_SECONDS.labels(stage)
+    for stage in ("fingerprint", "tarpit", "body", "log", "first_contact",
+                  "alert", "handler", "db_insert")
+}
@@ -0,0 +1,89 @@
+"""
+Persona — the fake identity a sensor presents.
+
+Every name, version, date and planted credential that appears in the bait
+content, the response headers and the alert footers comes from one Persona,
+built from config.yaml (``server.fake_*`` plus the optional ``persona``
+section).  fake_content.py renders its templates from it once at startup
+(static_cache.py), so differently-branded sensors cost nothing per request.
+
+Defaults reproduce the original CORP-INTRANET-OLD01 / ACME DMS identity.
+"""
+
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+
+@dataclass(frozen=True)
+class Persona:
+    # Host / software identity
+    server_name: str    = "CORP-INTRANET-OLD01"
+    server_header: str  = "Apache/2.2.14 (Win32)"
+    powered_by: str     = "PHP/5.2.17"
+    port: int           = 80                         # as reported in Apache error pages
+    company: str        = "ACME Corporation"
+    domain: str         = "corp.local"
+    app_name: str       = "Document Management System"
+    app_short: str      = "DMS"
+    app_version: str    = "2.1.4"
+
+    # Timeline — the server looks abandoned after last_active
+    first_year: int     = 2009
+    last_year: int      = 2013
+    last_active: str    = "2013-02-10"
+    last_deploy: str    = "2013-02-09 08:00:00"   # Last-Modified of every bait file
+
+    # Planted infrastructure + credentials
+    admin_user: str     = "admin"
+    admin_password: str = "C0rp!DMS#2011"
+    db_host: str        = "192.168.1.10"
+    db_name: str        = "intranet_dms"
+    db_user: str        = "dms_app"
+    db_password: str    = "Dms@2011!Prod#9x"
+    ldap_host: str      = "192.168.1.5"
+    ldap_password: str  = "LdapSvc!2009#Prod"
+    mail_password: str  = "M@ilP@ss2010!"
+    redis_host: str     = "192.168.1.15"
+    nas_host: str       = "nas01"
+
+    @classmethod
+    def from_config(cls, config: dict) -> "Persona":
+        srv = config.get("server") or {}
+        cfg = dict(config.get("persona") or {})
+        unknown = set(cfg) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"unknown persona key(s): {', '.join(sorted(unknown))}")
+        for key, name in (("fake_server_name", "server_name"),
+                          ("fake_identity",    "server_header"),
+                          ("fake_powered_by",  "powered_by")):
+            if key in srv:
+                cfg.setdefault(name, srv[key])
+        return cls(**cfg)
+
+    # ── Derived strings ───────────────────────────────────────────────────────
+
+    @property
+    def app_major(self) -> str:
+        """'2.1.4' → '2.1' — what the UI and X-Generator header show."""
+        return ".".join(self.app_version.split(".")[:2])
+
+    @property
+    def generator(self) -> str:
+        return f"{self.app_short} v{self.app_major}"
+
+    @property
+    def years(self) -> str:
+        return f"{self.first_year}&ndash;{self.last_year}"
+
+    @property
+    def http_last_modified(self) -> str:
+        when = datetime.fromisoformat(self.last_deploy).replace(tzinfo=timezone.utc)
+        return format_datetime(when, usegmt=True)
+
+    @property
+    def base_dn(self) -> str:
+        return ",".join(f"dc={part}" for part in self.domain.split("."))
+
+    def email(self, user: str) -> str:
+        return f"{user}@{self.domain}"
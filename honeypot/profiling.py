@@ -0,0 +1,241 @@
+"""
+On-demand profiling of the running sensor.
+
+A session is time-boxed and runs inside the live process, so hot spots can be
+captured under the real scanner mix without redeploying.  Each session writes
+to ``profiling.output_dir`` (default: the directory holding the DB):
+
+  profile-<stamp>.pstats      cProfile of the event-loop thread
+                              (python -m pstats / snakeviz)
+  profile-<stamp>.collapsed   sampled stacks of the event-loop thread in
+                              collapsed format (flamegraph.pl / speedscope)
+  profile-<stamp>.looplag.txt event-loop lag report — probe latency stats and
+                              every callback that blocked the loop for longer
+                              than ``slow_callback_ms`` (e.g. a synchronous
+                              SMTP send or a SQLite commit)
+
+Triggers:
+  * ``POST /debug/profile?seconds=30&mode=all|cprofile|sample`` on the admin
+    interface (``GET /debug/profile`` reports the current / last session)
+  * ``SIGUSR1`` — a session with the default duration.  In worker mode, signal
+    an individual worker's PID to profile that worker.
+"""
+
+import asyncio
+import cProfile
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("honeypot")
+
+MODES = ("all", "cprofile", "sample")
+
+
+class _SlowCallbackCollector(logging.Handler):
+    """Captures asyncio debug-mode 'Executing <Handle …> took N seconds' warnings."""
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.records: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        msg = record.getMessage()
+        if msg.startswith("Executing "):
+            self.records.append(f"{datetime.utcnow().isoformat()}  {msg}")
+
+
+class Profiler:
+    def __init__(
+        self,
+        output_dir: str,
+        default_seconds: float = 30.0,
+        max_seconds: float = 300.0,
+        sample_interval: float = 0.005,
+        slow_callback_ms: float = 100.0,
+    ):
+        self.output_dir       = Path(output_dir)
+        self.default_seconds  = float(default_seconds)
+        self.max_seconds      = float(max_seconds)
+        self.sample_interval  = float(sample_interval)
+        self.slow_callback    = float(slow_callback_ms) / 1000.0
+        self._active: Optional[dict] = None
+        self.last: Optional[dict] = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "Profiler":
+        cfg = config.get("profiling") or {}
+        default_dir = str(Path(config["logging"]["db_path"]).parent)
+        return cls(
+            output_dir=cfg.get("output_dir", default_dir),
+            default_seconds=cfg.get("default_seconds", 30),
+            max_seconds=cfg.get("max_seconds", 300),
+            sample_interval=cfg.get("sample_interval", 0.005),
+            slow_callback_ms=cfg.get("slow_callback_ms", 100),
+        )
+
+    @property
+    def active(self) -> Optional[dict]:
+        return self._active
+
+    # ── public API ────────────────────────────────────────────────────────────
+
+    def start(self, seconds: Optional[float] = None, mode: str = "all") -> dict:
+        """
+        Start a session on the running loop (must be called from the loop
+        thread).  Returns the session info; raises RuntimeError if one is
+        already running.
+        """
+        if self._active:
+            raise RuntimeError("a profiling session is already running")
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}")
+
+        seconds = min(float(seconds or self.default_seconds), self.max_seconds)
+        loop    = asyncio.get_running_loop()
+        stamp   = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        prefix  = self.output_dir / f"profile-{stamp}-{os.getpid()}"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        session = {
+            "pid":     os.getpid(),
+            "mode":    mode,
+            "seconds": seconds,
+            "started": datetime.utcnow().isoformat(),
+            "files":   [],
+        }
+
+        # Event-loop lag: debug-mode slow callback reports + a latency probe
+        collector = _SlowCallbackCollector()
+        logging.getLogger("asyncio").addHandler(collector)
+        old_debug, old_slow = loop.get_debug(), loop.slow_callback_duration
+        loop.slow_callback_duration = self.slow_callback
+        loop.set_debug(True)
+        lags: list[float] = []
+        probe = loop.create_task(self._probe_lag(lags, seconds))
+
+        profile = None
+        if mode in ("all", "cprofile"):
+            profile = cProfile.Profile()
+            profile.enable()
+
+        sampler = None
+        stacks: Counter = Counter()
+        if mode in ("all", "sample"):
+            sampler = threading.Thread(
+                target=self._sample,
+                args=(threading.get_ident(), stacks, time.monotonic() + seconds),
+                name="honeypot-profiler",
+                daemon=True,
+            )
+            sampler.start()
+
+        def _finish() -> None:
+            if profile is not None:
+                profile.disable()
+                path = f"{prefix}.pstats"
+                try:
+                    profile.dump_stats(path)
+                    session["files"].append(path)
+                except OSError as exc:
+                    session["error"] = str(exc)
+                    logger.error(f"Profiling session could not write {path}: {exc}")
+            loop.set_debug(old_debug)
+            loop.slow_callback_duration = old_slow
+            logging.getLogger("asyncio").removeHandler(collector)
+            probe.cancel()
+            loop.run_in_executor(None, self._write_reports, prefix, session,
+                                 sampler, stacks, lags, collector.records)
+
+        loop.call_later(seconds, _finish)
+        self._active = session
+        logger.warning(f"Profiling session started ({mode}, {seconds:.0f}s) → {prefix}.*")
+        return session
+
+    # ── internals ─────────────────────────────────────────────────────────────
+
+    def _sample(self, thread_id: int, stacks: Counter, deadline: float) -> None:
+        interval = self.sample_interval
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stacks[_collapse(frame)] += 1
+            time.sleep(interval)
+
+    @staticmethod
+    async def _probe_lag(lags: list, seconds: float, interval: float = 0.1) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + seconds
+        while loop.time() < deadline:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            lags.append(max(0.0, loop.time() - expected))
+
+    def _write_reports(self, prefix, session, sampler, stacks, lags, slow) -> None:
+        try:
+            self._write_files(prefix, session, sampler, stacks, lags, slow)
+        except OSError as exc:
+            session["error"] = str(exc)
+            logger.error(f"Profiling session reports could not be written: {exc}")
+        else:
+            logger.warning(f"Profiling session finished: {', '.join(session['files'])}")
+        finally:
+            # Always free the slot, or every later start() would be refused.
+            session["finished"] = datetime.utcnow().isoformat()
+            self.last, self._active = session, None
+
+    def _write_files(self, prefix, session, sampler, stacks, lags, slow) -> None:
+        if sampler is not None:
+            sampler.join()
+            path = f"{prefix}.collapsed"
+            with open(path, "w", encoding="utf-8") as fh:
+                for stack, count in stacks.most_common():
+                    fh.write(f"{stack} {count}\n")
+            session["files"].append(path)
+
+        path = f"{prefix}.looplag.txt"
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(f"Event-loop lag report — pid {session['pid']}, "
+                     f"{session['seconds']:.0f}s from {session['started']}\n\n")
+            if lags:
+                ordered = sorted(lags)
+                p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+                fh.write(f"probe samples : {len(ordered)}\n")
+                fh.write(f"lag mean      : {sum(ordered) / len(ordered) * 1000:.2f} ms\n")
+                fh.write(f"lag p99       : {p99 * 1000:.2f} ms\n")
+                fh.write(f"lag max       : {ordered[-1] * 1000:.2f} ms\n\n")
+            fh.write(f"Callbacks blocking the loop > {self.slow_callback * 1000:.0f} ms: "
+                     f"{len(slow)}\n")
+            for line in slow:
+                fh.write(f"  {line}\n")
+        session["files"].append(path)
+
+
+def _collapse(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def install_signal_handler(profiler: Profiler) -> None:
+    """Start a default-length session on SIGUSR1 (call from the running loop)."""
+    if not hasattr(signal, "SIGUSR1"):
+        return
+
+    def _on_signal() -> None:
+        try:
+            profiler.start()
+        except RuntimeError as exc:
+            logger.warning(f"SIGUSR1 ignored: {exc}")
+
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, _on_signal)
@@ -0,0 +1,344 @@
+"""
+Offline replay — re-run stored or captured traffic through the fingerprint and
+severity pipeline after signatures change.
+
+Sources:
+  * the SQLite DB (``--db``, default ``logging.db_path``) — opened read-only;
+    the id range is split into chunks and each pool worker reads its own
+    chunk, so rows are never pickled across processes on the way in
+  * a JSONL capture (``--jsonl``) — one request per line with at least
+    ``method``, ``path`` and ``source_ip``; ``headers`` (object or JSON string)
+    and ``timestamp`` are optional.  The parent reads it in chunks of lines.
+
+Classification runs in a ``ProcessPoolExecutor`` with a bounded number of
+chunks in flight.  Only verdicts that changed are sent back, and the parent
+writes them one transaction per chunk:
+
+  * default      a separate verdicts DB (``--out``, default
+                 ``<db dir>/replay-<stamp>.db``) — the live DB is only read
+  * --in-place   bulk UPDATE of the live ``requests`` table; each chunk is a
+                 short transaction with a busy timeout, so the sensor's writer
+                 is only ever blocked for one chunk
+
+Usage:
+    python -m honeypot replay [--config config.yaml] [--db PATH | --jsonl PATH]
+                              [--out verdicts.db | --in-place]
+                              [--workers N] [--chunk-size 20000]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import yaml
+
+from .fingerprint import fingerprint_request
+from .logger import classify_severity, is_internal_ip, parse_internal_ranges
+
+_VERDICT_COLUMNS = (
+    "is_internal", "scanner_type", "suspicious_path", "attack_in_headers",
+    "severity", "fingerprint_details", "tags",
+)
+
+_UPDATE_REQUEST = """UPDATE requests SET
+    is_internal = ?, scanner_type = ?, suspicious_path = ?, attack_in_headers = ?,
+    severity = ?, fingerprint_details = ?, tags = ?
+    WHERE id = ?"""
+
+_INSERT_VERDICT = """INSERT OR REPLACE INTO verdicts
+    (source, source_id, timestamp, source_ip, method, path, old_severity,
+     is_internal, scanner_type, suspicious_path, attack_in_headers,
+     severity, fingerprint_details, tags)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_SELECT_CHUNK = """SELECT id, timestamp, source_ip, method, path, headers,
+    is_internal, scanner_type, suspicious_path, attack_in_headers,
+    severity, fingerprint_details, tags
+    FROM requests WHERE id >= ? AND id < ?"""
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pool workers
+# ─────────────────────────────────────────────────────────────────────────────
+
+_networks: list = []
+
+
+def _init_worker(internal_ranges: list) -> None:
+    global _networks
+    _networks = parse_internal_ranges(internal_ranges)
+
+
+def _load_headers(raw) -> dict:
+    if isinstance(raw, dict):
+        return raw
+    try:
+        headers = json.loads(raw or "{}")
+    except (TypeError, ValueError):
+        return {}
+    return headers if isinstance(headers, dict) else {}
+
+
+def _user_agent(headers: dict) -> str:
+    for name, value in headers.items():
+        if name.lower() == "user-agent":
+            return value
+    return ""
+
+
+def _verdict(source_ip: str, method: str, path: str, headers: dict) -> tuple:
+    """Verdict columns in _VERDICT_COLUMNS order, as the live logger writes them."""
+    fp       = fingerprint_request(_user_agent(headers), path, headers)
+    internal = is_internal_ip(source_ip, _networks)
+    return (
+        1 if internal else 0,
+        fp.scanner_name,
+        1 if fp.suspicious_path else 0,
+        1 if fp.attack_in_headers else 0,
+        classify_severity(internal, method, fp.scanner_name),
+        fp.details,
+        json.dumps(fp.tags),
+    )
+
+
+def _replay_db_chunk(db_path: str, lo: int, hi: int) -> tuple:
+    """Re-classify rows lo <= id < hi; return (rows seen, changed rows, transitions)."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    changed, transitions, seen = [], Counter(), 0
+    try:
+        for row in conn.execute(_SELECT_CHUNK, (lo, hi)):
+            seen += 1
+            rid, ts, ip, method, path, headers = row[:6]
+            old = tuple(row[6:])
+            new = _verdict(ip, method, path, _load_headers(headers))
+            if new != old:
+                changed.append((rid, ts, ip, method, path, old[4], new))
+                transitions[(old[4], new[4])] += 1
+    finally:
+        conn.close()
+    return seen, changed, transitions
+
+
+def _replay_jsonl_chunk(lines: list) -> tuple:
+    """Re-classify (line number, JSON text) pairs from a capture."""
+    changed, transitions, seen = [], Counter(), 0
+    for number, line in lines:
+        try:
+            rec = json.loads(line)
+            ip, method, path = rec["source_ip"], rec["method"], rec["path"]
+        except (ValueError, KeyError, TypeError):
+            continue
+        seen += 1
+        old = rec.get("severity")
+        new = _verdict(ip, method, path, _load_headers(rec.get("headers")))
+        if new[4] != old:
+            transitions[(old, new[4])] += 1
+        # A capture has no stored verdict to diff against — keep every row
+        changed.append((number, rec.get("timestamp"), ip, method, path, old, new))
+    return seen, changed, transitions
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Work units
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _db_chunks(db_path: str, chunk_size: int) -> Iterator[tuple]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        lo, hi = conn.execute("SELECT MIN(id), MAX(id) FROM requests").fetchone()
+    finally:
+        conn.close()
+    if lo is None:
+        return
+    for start in range(lo, hi + 1, chunk_size):
+        yield (_replay_db_chunk, db_path, start, start + chunk_size)
+
+
+def _jsonl_chunks(path: str, chunk_size: int) -> Iterator[tuple]:
+    with open(path, encoding="utf-8") as fh:
+        lines = []
+        for number, line in enumerate(fh, start=1):
+            if line.strip():
+                lines.append((number, line))
+            if len(lines) >= chunk_size:
+                yield (_replay_jsonl_chunk, lines)
+                lines = []
+        if lines:
+            yield (_replay_jsonl_chunk, lines)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Output
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _VerdictSink:
+    """Writes changed verdicts, one transaction per chunk."""
+
+    def __init__(self, path: str, source: str, in_place: bool):
+        self.source   = source
+        self.in_place = in_place
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA busy_timeout = 30000")
+        if in_place:
+            return
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS verdicts (
+                source              TEXT    NOT NULL,
+                source_id           INTEGER NOT NULL,
+                timestamp           TEXT,
+                source_ip           TEXT,
+                method              TEXT,
+                path                TEXT,
+                old_severity        TEXT,
+                is_internal         INTEGER,
+                scanner_type        TEXT,
+                suspicious_path     INTEGER,
+                attack_in_headers   INTEGER,
+                severity            TEXT,
+                fingerprint_details TEXT,
+                tags                TEXT,
+                PRIMARY KEY (source, source_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_verdict_severity ON verdicts(severity);
+        """)
+
+    def write(self, changed: list) -> None:
+        if not changed:
+            return
+        with self.conn:
+            if self.in_place:
+                self.conn.executemany(
+                    _UPDATE_REQUEST, [(*new, rid) for rid, *_, new in changed],
+                )
+            else:
+                self.conn.executemany(_INSERT_VERDICT, [
+                    (self.source, sid, ts, ip, method, path, old, *new)
+                    for sid, ts, ip, method, path, old, new in changed
+                ])
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Driver
+# ─────────────────────────────────────────────────────────────────────────────
+
+def replay(
+    units: Iterator[tuple],
+    sink: _VerdictSink,
+    internal_ranges: list,
+    workers: int,
+) -> dict:
+    """Run every work unit through the pool, keeping at most 2 × workers in flight."""
+    seen = changed = 0
+    transitions: Counter = Counter()
+    started = time.perf_counter()
+    window  = max(1, workers * 2)
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(internal_ranges,),
+    ) as pool:
+        pending = set()
+        units = iter(units)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < window:
+                unit = next(units, None)
+                if unit is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(*unit))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                n, rows, trans = future.result()
+                sink.write(rows)
+                seen    += n
+                changed += len(rows)
+                transitions.update(trans)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows":        seen,
+        "written":     changed,
+        "elapsed":     elapsed,
+        "rows_per_s":  seen / elapsed if elapsed else 0.0,
+        "transitions": transitions,
+    }
+
+
+def print_summary(stats: dict, target: str) -> None:
+    print(f"\n  Replayed {stats['rows']:,} rows in {stats['elapsed']:.1f}s "
+          f"({stats['rows_per_s']:,.0f} rows/s)")
+    print(f"  Wrote {stats['written']:,} verdict(s) → {target}")
+    moved = {k: v for k, v in stats["transitions"].items() if k[0] != k[1]}
+    if moved:
+        print("\n  Severity changes:")
+        for (old, new), count in sorted(moved.items(), key=lambda kv: -kv[1]):
+            print(f"    {old or '—':>8} → {new:<8} {count:>10,}")
+    print()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="honeypot replay",
+        description="Re-classify stored or captured traffic with the current signatures",
+    )
+    parser.add_argument("--config", default="config.yaml",
+                        help="config.yaml for internal_ranges and the default DB path")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", help="SQLite DB to replay (default: logging.db_path)")
+    source.add_argument("--jsonl", help="JSONL capture to replay instead of the DB")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--out", help="verdicts DB to write (default: replay-<stamp>.db "
+                                      "next to the source DB)")
+    target.add_argument("--in-place", action="store_true",
+                        help="update the source DB's requests table directly")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, metavar="N")
+    parser.add_argument("--chunk-size", type=int, default=20_000, metavar="ROWS")
+    args = parser.parse_args(argv)
+
+    with open(args.config, encoding="utf-8") as fh:
+        config = yaml.safe_load(fh)
+    db_path = args.db or config["logging"]["db_path"]
+
+    if args.jsonl and args.in_place:
+        parser.error("--in-place only applies to a DB source")
+    if args.jsonl:
+        units  = _jsonl_chunks(args.jsonl, args.chunk_size)
+        source_name = os.path.abspath(args.jsonl)
+    else:
+        if not Path(db_path).exists():
+            parser.error(f"no such database: {db_path}")
+        units  = _db_chunks(db_path, args.chunk_size)
+        source_name = os.path.abspath(db_path)
+
+    if args.in_place:
+        out = db_path
+    else:
+        stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        out = args.out or str(Path(db_path).parent / f"replay-{stamp}.db")
+
+    sink = _VerdictSink(out, source_name, args.in_place)
+    try:
+        stats = replay(units, sink, config["internal_ranges"], args.workers)
+    finally:
+        sink.close()
+    print_summary(stats, out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
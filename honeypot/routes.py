@@ -6,18 +6,10 @@ engaged and lure them into submitting credentials or spending time exploring —
 buying time for the SOC to respond.
 """
 
-import json
 import re
 from urllib.parse import parse_qs
 from aiohttp import web
 
-# ── Fake credential store ──────────────────────────────────────────────────────
-# Only one valid plaintext credential — intentionally hard to guess.
-# Attackers will almost always reach the dashboard via SQLi instead.
-_VALID_CREDENTIALS = {
-    "admin": "C0rp!DMS#2011",
-}
-
 # ── SQLi bypass patterns ───────────────────────────────────────────────────────
 # When detected, login "succeeds" — attacker believes injection worked.
 _SQLI_BYPASS_PATTERNS = [
@@ -37,31 +29,21 @@ _SQLI_BYPASS_PATTERNS = [
 def _is_sqli(value: str) -> bool:
     return any(re.search(p, value, re.IGNORECASE) for p in _SQLI_BYPASS_PATTERNS)
 
-from .fake_content import (
-    FAKE_ENV,
-    FAKE_CONFIG_PHP,
-    FAKE_SQL_DUMP,
-    FAKE_ROBOTS_TXT,
-    FAKE_API_USERS,
-    FAKE_API_CONFIG,
-    get_index_html,
-    get_admin_login_html,
-    get_admin_dashboard_html,
-    get_admin_users_html,
-    get_backup_listing_html,
-    get_phpmyadmin_html,
-    get_tomcat_html,
-    get_404_html,
-)
-
-# ── Root / directory index ─────────────────────────────────────────────────────
-
-async def handle_index(request: web.Request) -> web.Response:
-    return web.Response(
-        text=get_index_html(),
-        content_type="text/html",
-        headers={"Last-Modified": "Sat, 09 Feb 2013 08:00:00 GMT"},
-    )
+from .context import CONTEXT_KEY
+from .backups import BackupDownloads, BackupSettings
+from .persona import Persona
+from .static_cache import build_static_responses
+
+STATIC_KEY  = "static_responses"
+PERSONA_KEY = "persona"
+
+
+def _static(name: str):
+    """Handler serving the pre-rendered response ``name`` (see static_cache.py)."""
+    async def handler(request: web.Request) -> web.Response:
+        return request.app[STATIC_KEY][name].respond(request)
+    handler.__name__ = f"handle_{name}"
+    return handler
 
 
 # ── Admin panel ────────────────────────────────────────────────────────────────
@@ -74,184 +56,97 @@ async def handle_admin_redirect(request: web.Request) -> web.Response:
     )
 
 
-async def handle_admin_login_get(request: web.Request) -> web.Response:
-    return web.Response(text=get_admin_login_html(error=False), content_type="text/html")
-
-
 async def handle_admin_login_post(request: web.Request) -> web.Response:
     """
     Intentionally vulnerable login handler (honeypot).
 
-    Decision tree (body already logged by middleware):
+    Decision tree (body already read, parsed and logged by middleware):
       1. SQLi pattern detected in username or password → fake success (bypass)
-      2. Credentials match _VALID_CREDENTIALS              → success
+      2. Credentials match the persona's admin account     → success
       3. Anything else                                     → error page
     """
-    try:
-        body = await request.text()
-        params = parse_qs(body)
-        username = params.get("username", [""])[0]
-        password = params.get("password", [""])[0]
-    except Exception:
-        username = password = ""
+    ctx = request.get(CONTEXT_KEY)
+    if ctx is not None:
+        form = ctx.form
+    else:
+        try:
+            form = {k: v[0] for k, v in parse_qs(await request.text()).items()}
+        except Exception:
+            form = {}
+    username = form.get("username", "")
+    password = form.get("password", "")
 
     # SQLi bypass — attacker thinks injection worked
     if _is_sqli(username) or _is_sqli(password):
         return web.Response(status=302, headers={"Location": "/admin/dashboard"})
 
-    # Valid credentials
-    if _VALID_CREDENTIALS.get(username) == password:
+    # Valid credentials — a single, intentionally hard-to-guess account.
+    # Attackers will almost always reach the dashboard via SQLi instead.
+    persona = request.app[PERSONA_KEY]
+    if username == persona.admin_user and password == persona.admin_password:
         return web.Response(status=302, headers={"Location": "/admin/dashboard"})
 
     # Wrong credentials — show error
-    return web.Response(
-        text=get_admin_login_html(error=True),
-        content_type="text/html",
-    )
-
-
-async def handle_admin_dashboard(request: web.Request) -> web.Response:
-    return web.Response(text=get_admin_dashboard_html(), content_type="text/html")
-
-
-async def handle_admin_users(request: web.Request) -> web.Response:
-    return web.Response(text=get_admin_users_html(), content_type="text/html")
-
-
-# ── Backup directory ───────────────────────────────────────────────────────────
-
-async def handle_backup_listing(request: web.Request) -> web.Response:
-    return web.Response(text=get_backup_listing_html(), content_type="text/html")
-
-
-async def handle_db_backup_sql(request: web.Request) -> web.Response:
-    """Serve the fake SQL dump as a downloadable file."""
-    return web.Response(
-        text=FAKE_SQL_DUMP,
-        content_type="application/octet-stream",
-        headers={
-            "Content-Disposition": "attachment; filename=db_backup.sql",
-        },
-    )
-
-
-async def handle_backup_zip(request: web.Request) -> web.Response:
-    """
-    Return a truncated ZIP magic header — suggests a large download is starting.
-    The tarpit delay will have already slowed the attacker down before this hits.
-    """
-    fake_zip_header = b"PK\x03\x04\x14\x00\x00\x00\x08\x00" + b"\x00" * 20
-    return web.Response(
-        body=fake_zip_header,
-        content_type="application/zip",
-        headers={"Content-Disposition": "attachment; filename=backup_20130201.zip"},
-    )
-
-
-# ── Legacy REST API ────────────────────────────────────────────────────────────
-
-async def handle_api_users(request: web.Request) -> web.Response:
-    return web.Response(
-        text=json.dumps(FAKE_API_USERS, indent=2),
-        content_type="application/json",
-    )
-
-
-async def handle_api_config(request: web.Request) -> web.Response:
-    return web.Response(
-        text=json.dumps(FAKE_API_CONFIG, indent=2),
-        content_type="application/json",
-    )
-
-
-# ── Exposed config / env files ─────────────────────────────────────────────────
-
-async def handle_env(request: web.Request) -> web.Response:
-    return web.Response(text=FAKE_ENV, content_type="text/plain")
-
-
-async def handle_config_php(request: web.Request) -> web.Response:
-    """PHP not processed → raw source leaks, as on a misconfigured server."""
-    return web.Response(text=FAKE_CONFIG_PHP, content_type="text/plain")
-
-
-async def handle_config_page(request: web.Request) -> web.Response:
-    return web.Response(
-        text=f"<pre>{FAKE_CONFIG_PHP}</pre>",
-        content_type="text/html",
-    )
-
-
-# ── Third-party management consoles ───────────────────────────────────────────
-
-async def handle_phpmyadmin(request: web.Request) -> web.Response:
-    return web.Response(text=get_phpmyadmin_html(), content_type="text/html")
-
-
-async def handle_tomcat_manager(request: web.Request) -> web.Response:
-    return web.Response(
-        text=get_tomcat_html(),
-        content_type="text/html",
-        status=401,
-        headers={"WWW-Authenticate": 'Basic realm="Tomcat Manager Application"'},
-    )
-
-
-# ── robots.txt (intentionally "leaks" bait paths) ─────────────────────────────
-
-async def handle_robots(request: web.Request) -> web.Response:
-    return web.Response(text=FAKE_ROBOTS_TXT, content_type="text/plain")
+    return request.app[STATIC_KEY]["admin_login_fail"].respond(request)
 
 
 # ── Catch-all 404 ─────────────────────────────────────────────────────────────
 
 async def handle_404(request: web.Request) -> web.Response:
-    return web.Response(
-        text=get_404_html(request.path),
-        content_type="text/html",
-        status=404,
-    )
+    return request.app[STATIC_KEY]["not_found"].respond(request)
 
 
 # ── Route registration ─────────────────────────────────────────────────────────
 
-def setup_routes(app: web.Application) -> None:
+def setup_routes(
+    app: web.Application,
+    persona: Persona,
+    backups: BackupSettings = BackupSettings(),
+) -> None:
+    # Every page (bar the login POST decision) is rendered once here
+    app[PERSONA_KEY] = persona
+    app[STATIC_KEY]  = build_static_responses(persona, backups)
     r = app.router
 
     # Root
-    r.add_get("/", handle_index)
+    r.add_get("/", _static("index"))
 
     # Admin
     r.add_get("/admin",            handle_admin_redirect)
     r.add_get("/admin/",           handle_admin_redirect)
-    r.add_get("/admin/login",      handle_admin_login_get)
+    r.add_get("/admin/login",      _static("admin_login"))
     r.add_post("/admin/login",     handle_admin_login_post)
-    r.add_get("/admin/dashboard",  handle_admin_dashboard)
-    r.add_get("/admin/users",      handle_admin_users)
+    r.add_get("/admin/dashboard",  _static("admin_dashboard"))
+    r.add_get("/admin/users",      _static("admin_users"))
 
     # Backups
-    r.add_get("/backup",           handle_backup_listing)
-    r.add_get("/backup/",          handle_backup_listing)
-    r.add_get("/db_backup.sql",    handle_db_backup_sql)
-    r.add_get("/backup.zip",       handle_backup_zip)
+    r.add_get("/backup",           _static("backup_listing"))
+    r.add_get("/backup/",          _static("backup_listing"))
+    if backups.enabled:
+        downloads = BackupDownloads(backups, persona)
+        r.add_get("/db_backup.sql", downloads.handle_sql)
+        r.add_get("/backup.zip",    downloads.handle_zip)
+    else:
+        r.add_get("/db_backup.sql", _static("db_backup_sql"))
+        r.add_get("/backup.zip",    _static("backup_zip"))
 
     # Legacy API
-    r.add_get("/old-api/v1/users",  handle_api_users)
-    r.add_get("/old-api/v1/config", handle_api_config)
+    r.add_get("/old-api/v1/users",  _static("api_users"))
+    r.add_get("/old-api/v1/config", _static("api_config"))
 
     # Exposed files
-    r.add_get("/.env",       handle_env)
-    r.add_get("/config.php", handle_config_php)
-    r.add_get("/config",     handle_config_page)
+    r.add_get("/.env",       _static("env"))
+    r.add_get("/config.php", _static("config_php"))
+    r.add_get("/config",     _static("config_page"))
 
     # Third-party consoles
-    r.add_get("/phpmyadmin",        handle_phpmyadmin)
-    r.add_get("/phpmyadmin/",       handle_phpmyadmin)
-    r.add_get("/manager/html",      handle_tomcat_manager)
-    r.add_get("/manager/html/",     handle_tomcat_manager)
+    r.add_get("/phpmyadmin",        _static("phpmyadmin"))
+    r.add_get("/phpmyadmin/",       _static("phpmyadmin"))
+    r.add_get("/manager/html",      _static("tomcat_manager"))
+    r.add_get("/manager/html/",     _static("tomcat_manager"))
 
     # robots.txt
-    r.add_get("/robots.txt", handle_robots)
+    r.add_get("/robots.txt", _static("robots"))
 
     # Catch-all — must be last
     r.add_route("*", "/{path_info:.*}", handle_404)
@@ -0,0 +1,137 @@
+"""
+Event-loop selection and aiohttp server tuning (``runtime:`` in config.yaml).
+
+Almost all of the sensor's work is socket handling and timers (tarpit sleeps),
+so the event loop implementation and the server's connection limits matter
+more than raw Python speed.  This module:
+
+  * picks uvloop when it is installed and requested (``event_loop: auto``)
+  * serves one or more aiohttp applications with the configured listen
+    backlog, keep-alive timeout, request line / header limits and handler
+    cancellation behaviour
+  * prints a startup report of the effective settings
+"""
+
+import asyncio
+import logging
+import signal
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger("honeypot")
+
+_EVENT_LOOPS = ("auto", "uvloop", "asyncio")
+
+
+@dataclass
+class RuntimeSettings:
+    event_loop: str             = "auto"    # auto | uvloop | asyncio
+    backlog: int                = 128       # listen() backlog per socket
+    keepalive_timeout: float    = 75.0      # idle keep-alive connection lifetime
+    max_line_size: int          = 8190      # max request line bytes
+    max_field_size: int         = 8190      # max header field bytes
+    max_headers: int            = 128       # max header count
+    handler_cancellation: bool  = False     # cancel handlers (and tarpit sleeps) on disconnect
+    shutdown_timeout: float     = 60.0      # grace period for in-flight requests
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RuntimeSettings":
+        cfg = dict(config.get("runtime") or {})
+        unknown = set(cfg) - set(cls.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown runtime setting(s): {', '.join(sorted(unknown))}")
+
+        settings = cls(**cfg)
+        if settings.event_loop not in _EVENT_LOOPS:
+            raise ValueError(
+                f"runtime.event_loop must be one of {', '.join(_EVENT_LOOPS)}, "
+                f"got {settings.event_loop!r}"
+            )
+        settings.backlog              = int(settings.backlog)
+        settings.keepalive_timeout    = float(settings.keepalive_timeout)
+        settings.max_line_size        = int(settings.max_line_size)
+        settings.max_field_size       = int(settings.max_field_size)
+        settings.max_headers          = int(settings.max_headers)
+        settings.handler_cancellation = bool(settings.handler_cancellation)
+        settings.shutdown_timeout     = float(settings.shutdown_timeout)
+        return settings
+
+    def runner_kwargs(self) -> dict:
+        """Keyword arguments for web.AppRunner (forwarded to the HTTP protocol)."""
+        return {
+            "access_log":           None,
+            "keepalive_timeout":    self.keepalive_timeout,
+            "max_line_size":        self.max_line_size,
+            "max_field_size":       self.max_field_size,
+            "max_headers":          self.max_headers,
+            "handler_cancellation": self.handler_cancellation,
+            "shutdown_timeout":     self.shutdown_timeout,
+        }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Event loop selection
+# ─────────────────────────────────────────────────────────────────────────────
+
+def loop_factory(settings: RuntimeSettings) -> tuple[Optional[Callable], str]:
+    """Return (loop factory or None for the default, human-readable name)."""
+    if settings.event_loop in ("auto", "uvloop"):
+        try:
+            import uvloop
+        except ImportError:
+            if settings.event_loop == "uvloop":
+                logger.warning("runtime.event_loop is 'uvloop' but uvloop is not installed "
+                               "— falling back to asyncio")
+        else:
+            return uvloop.new_event_loop, f"uvloop {uvloop.__version__}"
+    return None, "asyncio"
+
+
+def run(main, settings: RuntimeSettings):
+    """asyncio.run() equivalent that honours ``runtime.event_loop``."""
+    factory, _ = loop_factory(settings)
+    with asyncio.Runner(loop_factory=factory) as runner:
+        return runner.run(main)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Serving
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def serve(
+    listeners: list,                # [(web.Application, host, port), ...]
+    settings: RuntimeSettings,
+    reuse_port: Optional[bool] = None,
+) -> None:
+    """Serve every listener until SIGINT / SIGTERM, then shut down gracefully."""
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    runners: list[web.AppRunner] = []
+    try:
+        for app, host, port in listeners:
+            runner = web.AppRunner(app, **settings.runner_kwargs())
+            await runner.setup()
+            runners.append(runner)
+            site = web.TCPSite(
+                runner, host, int(port),
+                backlog=settings.backlog,
+                reuse_port=reuse_port,
+            )
+            await site.start()
+        await stop.wait()
+    finally:
+        for runner in reversed(runners):
+            await runner.cleanup()
+
+
+def print_report(settings: RuntimeSettings) -> None:
+    _, loop_name = loop_factory(settings)
+    print(f"[*] Event loop            {loop_name}")
+    for key, value in asdict(settings).items():
+        if key != "event_loop":
+            print(f"[*]   {key:<22}{value}")
@@ -0,0 +1,208 @@
+"""
+Pre-rendered bait responses.
+
+Every page that does not depend on the request is rendered from the
+deployment's Persona once at startup (or on reload) into immutable bytes,
+together with gzip and deflate variants, a strong ETag per variant and the
+persona's fixed Last-Modified date.  Serving one is then a dict lookup,
+an Accept-Encoding check and a socket write; conditional requests
+(If-None-Match / If-Modified-Since) get a bodiless 304 like a real Apache.
+"""
+
+import gzip
+import hashlib
+import functools
+import json
+import zlib
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+
+from aiohttp import web
+
+from .fake_content import (
+    FAKE_ROBOTS_TXT,
+    get_404_html,
+    get_admin_dashboard_html,
+    get_admin_login_html,
+    get_admin_users_html,
+    get_api_config,
+    get_api_users,
+    get_backup_listing_html,
+    get_config_php,
+    get_env_file,
+    get_index_html,
+    get_phpmyadmin_html,
+    get_sql_dump,
+    get_tomcat_html,
+)
+from .backups import BackupSettings
+from .persona import Persona
+
+MIN_COMPRESS_SIZE = 256     # smaller bodies are sent as-is (as Apache's mod_deflate does)
+
+_FAKE_ZIP_HEADER = b"PK\x03\x04\x14\x00\x00\x00\x08\x00" + b"\x00" * 20
+
+
+@dataclass(frozen=True)
+class StaticResponse:
+    body: bytes
+    content_type: str
+    status: int = 200
+    headers: dict = field(default_factory=dict)
+    variants: dict = field(default_factory=dict)    # encoding → (bytes, etag)
+    etag: str = ""
+    last_modified: str = ""
+
+    @classmethod
+    def render(
+        cls,
+        body,
+        content_type: str,
+        status: int = 200,
+        headers: dict = None,
+        compress: bool = True,
+        last_modified: str = "",
+    ) -> "StaticResponse":
+        raw  = body.encode("utf-8") if isinstance(body, str) else bytes(body)
+        tag  = hashlib.blake2b(raw, digest_size=8).hexdigest()
+        variants = {}
+        if compress and len(raw) >= MIN_COMPRESS_SIZE:
+            # mtime=0 keeps the gzip bytes (and so the ETag) identical across restarts
+            variants["gzip"]    = (gzip.compress(raw, 9, mtime=0), f'"{tag}-gzip"')
+            variants["deflate"] = (zlib.compress(raw, 9), f'"{tag}-deflate"')
+        return cls(
+            body=raw,
+            content_type=content_type,
+            status=status,
+            headers=dict(headers or {}),
+            variants=variants,
+            etag=f'"{tag}"',
+            last_modified=last_modified,
+        )
+
+    def _etags(self) -> set:
+        return {self.etag, *(etag for _, etag in self.variants.values())}
+
+    def not_modified(self, request: web.Request) -> bool:
+        if self.status != 200:
+            return False
+        inm = request.headers.get("If-None-Match")
+        if inm is not None:
+            if inm.strip() == "*":
+                return True
+            tags = {t.strip().removeprefix("W/") for t in inm.split(",")}
+            return bool(tags & self._etags())
+        ims = request.headers.get("If-Modified-Since")
+        if ims and self.last_modified:
+            try:
+                return parsedate_to_datetime(ims) >= parsedate_to_datetime(self.last_modified)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def respond(self, request: web.Request) -> web.Response:
+        headers = dict(self.headers)
+        if self.last_modified:
+            headers["Last-Modified"] = self.last_modified
+        if self.variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        encoding = _pick_encoding(request.headers.get("Accept-Encoding", ""), self.variants)
+        body, etag = self.variants[encoding] if encoding else (self.body, self.etag)
+        headers["ETag"] = etag
+
+        if self.not_modified(request):
+            return web.Response(status=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        headers["Content-Type"] = self.content_type
+        return web.Response(status=self.status, body=body, headers=headers)
+
+
+def _pick_encoding(accept: str, variants: dict):
+    """First of gzip / deflate the client accepts (q > 0), or None for identity."""
+    if not variants or not accept:
+        return None
+    accepted = set()
+    for part in accept.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+    for coding in ("gzip", "deflate"):
+        if coding in accepted or "*" in accepted:
+            return coding
+    return None
+
+
+class NotFoundPage:
+    """The Apache 404 page, split around the echoed path at startup."""
+
+    _MARKER = "\0PATH\0"
+
+    def __init__(self, persona: Persona):
+        head, _, tail = get_404_html(persona, self._MARKER).partition(self._MARKER)
+        self.head = head.encode("utf-8")
+        self.tail = tail.encode("utf-8")
+
+    def respond(self, request: web.Request) -> web.Response:
+        return web.Response(
+            status=404,
+            body=self.head + request.path.encode("utf-8", "replace") + self.tail,
+            headers={"Content-Type": "text/html; charset=utf-8"},
+        )
+
+
+def build_static_responses(persona: Persona, backups: BackupSettings = BackupSettings()) -> dict:
+    """
+    Render every request-independent bait response; keys are route names.
+    The db_backup_sql / backup_zip entries are only routed when streamed
+    backups (backups.py) are disabled.
+    """
+    p     = persona
+    html  = "text/html; charset=utf-8"
+    plain = "text/plain; charset=utf-8"
+    config_php = get_config_php(p)
+    # The "server" was last touched on the persona's last deploy — every file claims that date
+    render = functools.partial(StaticResponse.render, last_modified=p.http_last_modified)
+    return {
+        "index":            render(get_index_html(p), html),
+        "admin_login":      render(get_admin_login_html(p, error=False), html),
+        "admin_login_fail": render(get_admin_login_html(p, error=True), html),
+        "admin_dashboard":  render(get_admin_dashboard_html(p), html),
+        "admin_users":      render(get_admin_users_html(p), html),
+        "backup_listing":   render(get_backup_listing_html(
+            p,
+            sql_size=backups.listing_size(backups.sql_bytes),
+            zip_size=backups.listing_size(backups.zip_bytes),
+        ), html),
+        "db_backup_sql":    render(
+            get_sql_dump(p), "application/octet-stream",
+            headers={"Content-Disposition": "attachment; filename=db_backup.sql"},
+        ),
+        "backup_zip":       render(
+            _FAKE_ZIP_HEADER, "application/zip", compress=False,
+            headers={"Content-Disposition": f"attachment; filename=backup_{p.last_year}0201.zip"},
+        ),
+        "api_users":        render(
+            json.dumps(get_api_users(p), indent=2), "application/json; charset=utf-8",
+        ),
+        "api_config":       render(
+            json.dumps(get_api_config(p), indent=2), "application/json; charset=utf-8",
+        ),
+        "env":              render(get_env_file(p), plain),
+        "config_php":       render(config_php, plain),
+        "config_page":      render(f"<pre>{config_php}</pre>", html),
+        "phpmyadmin":       render(get_phpmyadmin_html(p), html),
+        "tomcat_manager":   render(
+            get_tomcat_html(p), html, status=401,
+            headers={"WWW-Authenticate": 'Basic realm="Tomcat Manager Application"'},
+        ),
+        "robots":           render(FAKE_ROBOTS_TXT, plain),
+        "not_found":        NotFoundPage(p),
+    }
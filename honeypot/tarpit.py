@@ -21,6 +21,8 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List
 
+from .metrics import TARPIT_HELD
+
 logger = logging.getLogger("honeypot")
 
 
@@ -77,10 +79,18 @@ class TarpitMiddleware:
         if method.upper() == "POST":
             # Always delay POST requests (simulate authentication processing)
             logger.debug(f"Tarpit POST delay {self.post_delay}s for {ip}")
-            await asyncio.sleep(self.post_delay)
+            await self._hold(self.post_delay)
             return
 
         wait = self.delay_seconds(ip)
         if wait > 0:
             logger.debug(f"Tarpit delay {wait:.1f}s for {ip} ({self._count(ip)} reqs in window)")
-            await asyncio.sleep(wait)
+            await self._hold(wait)
+
+    @staticmethod
+    async def _hold(seconds: float) -> None:
+        TARPIT_HELD.inc()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            TARPIT_HELD.dec()
@@ -0,0 +1,258 @@
+"""
+Multi-process worker mode (``--workers N``).
+
+  supervisor (parent process)
+    ├── N aiohttp workers, each binding host:port with SO_REUSEPORT
+    │     pipeline steps 1-3 (source IP, fingerprint, body read), forwards
+    │     the request over a multiprocessing queue, then tarpits and responds
+    └── single writer: pipeline steps 4-5 (SQLite log, first-contact check,
+          alert dedup + dispatch) for every worker's traffic
+
+The kernel load-balances connections across the workers, so fingerprinting,
+body handling and response rendering scale with cores.  All SQLite writes and
+the AlertTracker live in the supervisor, so DB rows and alerts are exactly what
+a single-process sensor would produce.  Tarpit history is per worker.
+
+The supervisor restarts any worker that exits unexpectedly and serves the
+admin interface; workers ship metric snapshots to it over the same queue.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import queue
+import signal
+import socket
+import time
+
+from aiohttp import web
+
+from . import runtime
+from .admin import admin_settings, create_admin_app
+from .metrics import FORWARD_DROPPED, REGISTRY
+from .profiling import Profiler, install_signal_handler
+
+logger = logging.getLogger("honeypot")
+
+_BATCH_SIZE     = 500       # max records handled per queue drain
+_RESTART_DELAY  = 1.0       # seconds before restarting a crashed worker
+_MAX_RESTART_DELAY = 30.0
+_METRICS_INTERVAL = 5.0     # seconds between worker metric snapshots
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Worker side
+# ─────────────────────────────────────────────────────────────────────────────
+
+class QueueForwarder:
+    """
+    Drop-in replacement for RequestProcessor inside a worker: ships the
+    request to the supervisor instead of logging it locally.  Never blocks
+    the event loop — if the supervisor falls behind, records are dropped and
+    counted rather than queued without limit.
+    """
+
+    def __init__(self, event_queue):
+        self._queue  = event_queue
+        self.dropped = 0
+
+    def process(self, ctx) -> None:
+        try:
+            self._queue.put_nowait(ctx)
+        except queue.Full:
+            self.dropped += 1
+            FORWARD_DROPPED.inc()
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Writer queue full — {self.dropped} record(s) dropped")
+
+    def push_metrics(self, worker_id: int) -> None:
+        try:
+            self._queue.put_nowait(("metrics", worker_id, REGISTRY.snapshot()))
+        except queue.Full:
+            pass
+
+
+async def _ship_metrics(forwarder: QueueForwarder, worker_id: int) -> None:
+    while True:
+        await asyncio.sleep(_METRICS_INTERVAL)
+        forwarder.push_metrics(worker_id)
+
+
+def _worker_main(config: dict, event_queue, worker_id: int) -> None:
+    from .app import create_app
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(
+        f"%(asctime)s | %(levelname)-8s | worker-{worker_id} | %(message)s"
+    ))
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+
+    srv = config["server"]
+    settings = runtime.RuntimeSettings.from_config(config)
+
+    async def _main() -> None:
+        forwarder = QueueForwarder(event_queue)
+        app = create_app(config, processor=forwarder)
+        install_signal_handler(Profiler.from_config(config))
+        shipper = asyncio.create_task(_ship_metrics(forwarder, worker_id))
+        try:
+            await runtime.serve([(app, srv["host"], srv["port"])], settings, reuse_port=True)
+        finally:
+            shipper.cancel()
+
+    runtime.run(_main(), settings)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Supervisor side
+# ─────────────────────────────────────────────────────────────────────────────
+
+class Supervisor:
+    def __init__(self, config: dict, workers: int):
+        self.config      = config
+        self.num_workers = workers
+        self._ctx        = multiprocessing.get_context("spawn")
+        self._queue      = self._ctx.Queue(
+            maxsize=int(config["server"].get("worker_queue_size", 10_000))
+        )
+        self._procs: dict[int, multiprocessing.Process] = {}
+        self._started: dict[int, float] = {}
+        self._restarts: dict[int, int] = {}
+        self._stopping = asyncio.Event()
+        self._worker_metrics: dict[int, dict] = {}
+
+    # ── worker management ─────────────────────────────────────────────────────
+
+    def _spawn(self, worker_id: int) -> None:
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(self.config, self._queue, worker_id),
+            name=f"honeypot-worker-{worker_id}",
+            daemon=True,
+        )
+        proc.start()
+        self._started[worker_id] = time.monotonic()
+        self._procs[worker_id] = proc
+        logger.info(f"Worker {worker_id} started (pid {proc.pid})")
+
+    async def _supervise(self) -> None:
+        while not self._stopping.is_set():
+            for worker_id, proc in list(self._procs.items()):
+                if proc.is_alive():
+                    continue
+                # A worker that lived a while resets its backoff
+                if time.monotonic() - self._started[worker_id] > _MAX_RESTART_DELAY:
+                    self._restarts[worker_id] = 0
+                fails = self._restarts.get(worker_id, 0)
+                delay = min(_RESTART_DELAY * (2 ** fails), _MAX_RESTART_DELAY)
+                self._restarts[worker_id] = fails + 1
+                logger.error(
+                    f"Worker {worker_id} (pid {proc.pid}) exited with code "
+                    f"{proc.exitcode} — restarting in {delay:.0f}s"
+                )
+                del self._procs[worker_id]
+                asyncio.get_running_loop().call_later(delay, self._respawn, worker_id)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+
+    def _respawn(self, worker_id: int) -> None:
+        if not self._stopping.is_set() and worker_id not in self._procs:
+            self._spawn(worker_id)
+
+    def _stop_workers(self) -> None:
+        for proc in self._procs.values():
+            if proc.is_alive():
+                proc.terminate()
+        for proc in self._procs.values():
+            proc.join(timeout=10)
+            if proc.is_alive():
+                proc.kill()
+
+    # ── single writer ─────────────────────────────────────────────────────────
+
+    def _next_batch(self, timeout: float) -> list:
+        """Blocking read (run in an executor): one record, then whatever is ready."""
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < _BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    async def _drain(self, processor) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await loop.run_in_executor(None, self._next_batch, 0.5)
+            for ctx in batch:
+                if isinstance(ctx, tuple) and ctx[0] == "metrics":
+                    self._worker_metrics[ctx[1]] = ctx[2]
+                    continue
+                try:
+                    processor.process(ctx)
+                except Exception as exc:
+                    logger.error(f"Failed to process forwarded request: {exc}")
+            if not batch and self._stopping.is_set():
+                return
+
+    # ── main ──────────────────────────────────────────────────────────────────
+
+    async def _serve_admin(self, settings: runtime.RuntimeSettings) -> None:
+        admin_cfg = admin_settings(self.config)
+        if not admin_cfg["enabled"]:
+            return
+        profiler = Profiler.from_config(self.config)
+        install_signal_handler(profiler)
+        app = create_admin_app(
+            self.config,
+            extra_metrics=lambda: list(self._worker_metrics.values()),
+            profiler=profiler,
+        )
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, admin_cfg["host"], int(admin_cfg["port"]),
+                           backlog=settings.backlog)
+        await site.start()
+        try:
+            await self._stopping.wait()
+        finally:
+            await runner.cleanup()
+
+    async def run(self, settings: runtime.RuntimeSettings) -> None:
+        from .app import build_processor
+
+        processor = build_processor(self.config)
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopping.set)
+
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+
+        drain = asyncio.create_task(self._drain(processor))
+        admin = asyncio.create_task(self._serve_admin(settings))
+        await self._supervise()
+        await admin
+
+        logger.info("Shutting down workers")
+        await loop.run_in_executor(None, self._stop_workers)
+        await drain
+        await loop.run_in_executor(None, processor.close)
+
+        # Let in-flight alert dispatches finish
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        if pending:
+            await asyncio.wait(pending, timeout=15)
+
+
+def run_workers(config: dict, workers: int, settings: runtime.RuntimeSettings) -> None:
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise SystemExit("--workers requires SO_REUSEPORT (Linux / BSD)")
+    runtime.run(Supervisor(config, workers).run(settings), settings)
@@ -0,0 +1,57 @@
+"""
+Shared fixtures.  ``config`` is the shipped config.yaml with every file the
+sensor writes (DB, log, profiles) moved into the test's temp dir, tarpit
+delays off and no alert delivery, so tests never touch data/.
+"""
+
+import copy
+import logging
+from pathlib import Path
+
+import pytest
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def pytest_configure(config):
+    # app["..."] / request["..."] string keys are used throughout honeypot/
+    config.addinivalue_line("filterwarnings", "ignore::aiohttp.web_exceptions.NotAppKeyWarning")
+
+
+@pytest.fixture(scope="session")
+def shipped_config() -> dict:
+    with open(ROOT / "config.yaml", encoding="utf-8") as fh:
+        return yaml.safe_load(fh)
+
+
+@pytest.fixture
+def config(shipped_config, tmp_path) -> dict:
+    cfg = copy.deepcopy(shipped_config)
+    cfg["logging"]["db_path"]  = str(tmp_path / "honeypot.db")
+    cfg["logging"]["log_file"] = str(tmp_path / "honeypot.log")
+    cfg["profiling"]["output_dir"] = str(tmp_path)
+    for key in ("base_delay", "max_delay", "post_delay"):
+        cfg["tarpit"][key] = 0.0
+    cfg["alerting"]["email"]["enabled"] = False
+    cfg["alerting"]["webhook"]["enabled"] = False
+    return cfg
+
+
+@pytest.fixture(autouse=True)
+def _detach_log_handlers():
+    """HoneypotLogger adds file/console handlers to the shared logger; drop them after each test."""
+    yield
+    hp = logging.getLogger("honeypot")
+    for handler in list(hp.handlers):
+        hp.removeHandler(handler)
+        handler.close()
+
+
+@pytest.fixture
+def hp_logger(config):
+    from honeypot.logger import HoneypotLogger
+
+    hp = HoneypotLogger(config)
+    yield hp
+    hp.close()
@@ -0,0 +1,82 @@
+"""Helpers shared by the test modules."""
+
+import asyncio
+import socket
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import yaml
+from aiohttp.test_utils import TestClient, TestServer
+
+from honeypot.context import RequestContext
+from honeypot.fingerprint import fingerprint_request
+
+
+def run(coro):
+    """Run a coroutine on a fresh event loop (the suite needs no asyncio plugin)."""
+    return asyncio.run(coro)
+
+
+class FakeClock:
+    """A clock callable for components that take ``clock=``; advance ``now`` by hand."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"nothing listening on port {port}")
+
+
+def write_config(config: dict, path) -> str:
+    with open(path, "w", encoding="utf-8") as fh:
+        yaml.safe_dump(config, fh)
+    return str(path)
+
+
+def make_ctx(ip: str = "203.0.113.9", path: str = "/", method: str = "GET",
+             user_agent: str = "Mozilla/5.0 (X11; Linux x86_64)", body: str = "", headers=None,
+             query=None) -> RequestContext:
+    """A fingerprinted RequestContext, as the middleware would build it."""
+    ctx = RequestContext(
+        source_ip=ip, method=method, path=path, user_agent=user_agent,
+        headers={"User-Agent": user_agent, **(headers or {})}, query=dict(query or {}),
+        timestamp=datetime.utcnow().isoformat(), body=body,
+    )
+    ctx.fingerprint = fingerprint_request(user_agent, path, ctx.headers)
+    return ctx
+
+
+@asynccontextmanager
+async def bait_client(app, **session_kwargs):
+    """An aiohttp test client for ``app`` on an ephemeral port."""
+    async with TestClient(TestServer(app), **session_kwargs) as client:
+        yield client
+
+
+def query(db_path, sql: str, *params) -> list:
+    """Rows of ``sql`` as dicts, on a fresh connection."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
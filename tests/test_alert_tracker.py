@@ -0,0 +1,52 @@
+from honeypot.app import AlertTracker, build_tracker
+
+from .helpers import FakeClock
+
+
+def test_cooldown_suppresses_repeats_until_it_expires():
+    clock = FakeClock()
+    tracker = AlertTracker(cooldown_seconds=300, clock=clock)
+    assert tracker.should_alert("10.0.0.5", "HIGH")
+    tracker.record("10.0.0.5", "HIGH")
+    assert not tracker.should_alert("10.0.0.5", "HIGH")
+    assert not tracker.should_alert("10.0.0.5", "MEDIUM")
+    clock.now += 301
+    assert tracker.should_alert("10.0.0.5", "HIGH")
+    assert len(tracker) == 0                        # expired entries are dropped
+
+
+def test_escalation_alerts_inside_the_cooldown():
+    tracker = AlertTracker(cooldown_seconds=300, clock=FakeClock())
+    tracker.record("10.0.0.5", "HIGH")
+    assert tracker.should_alert("10.0.0.5", "CRITICAL")
+
+
+def test_max_entries_drops_the_oldest():
+    tracker = AlertTracker(cooldown_seconds=300, max_entries=3, clock=FakeClock())
+    for i in range(5):
+        tracker.record(f"10.0.0.{i}", "HIGH")
+    assert len(tracker) == 3
+    assert tracker.should_alert("10.0.0.0", "HIGH")
+    assert not tracker.should_alert("10.0.0.4", "HIGH")
+
+
+def test_subnet_cooldown_covers_address_hopping():
+    tracker = AlertTracker(cooldown_seconds=300, subnet_prefix_v4=24,
+                           subnet_prefix_v6=64, clock=FakeClock())
+    tracker.record("203.0.113.7", "MEDIUM")
+    assert not tracker.should_alert("203.0.113.99", "MEDIUM")
+    assert tracker.should_alert("203.0.114.1", "MEDIUM")
+    tracker.record("2001:db8::1", "MEDIUM")
+    assert not tracker.should_alert("2001:db8::ffff", "MEDIUM")
+    assert tracker.should_alert("unknown", "MEDIUM")     # non-addresses are per-key only
+
+
+def test_build_tracker_reads_alerting_section(config):
+    config["alerting"].update(cooldown_seconds=10, max_tracked=2, subnet_prefix_v4=16)
+    tracker = build_tracker(config)
+    tracker.record("10.1.2.3", "HIGH")
+    assert not tracker.should_alert("10.1.9.9", "HIGH")
+    assert tracker.should_alert("10.2.0.1", "HIGH")
+    tracker.record("10.2.0.1", "HIGH")
+    tracker.record("10.3.0.1", "HIGH")
+    assert len(tracker) == 2
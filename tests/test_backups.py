@@ -0,0 +1,53 @@
+import io
+import zipfile
+
+import pytest
+
+from honeypot.app import create_app
+from honeypot.backups import MB, BackupSettings, SqlDump, ZipArchive
+from honeypot.persona import Persona
+
+from .helpers import bait_client, run
+
+
+def test_sql_dump_is_exact_size_and_deterministic():
+    dump = SqlDump(Persona(), 300_000, "seed", 4096)
+    body = b"".join(dump)
+    assert len(body) == dump.size == 300_000
+    assert body == b"".join(SqlDump(Persona(), 300_000, "seed", 4096))
+    assert body.startswith(dump.head)
+    assert body.rstrip().endswith(b"3:14:07")
+    assert max(len(c) for c in dump) <= 4096
+
+
+def test_zip_archive_is_a_valid_exact_size_zip():
+    archive = ZipArchive(Persona(), 2 * MB, "seed", 16 * 1024)
+    data = b"".join(archive)
+    assert len(data) == archive.size == 2 * MB
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert len(zf.namelist()) == len(archive.entries)
+
+
+def test_oversized_zip_is_rejected():
+    with pytest.raises(ValueError):
+        BackupSettings.from_config({"backups": {"zip_size_mb": 5000}})
+
+
+def test_downloads_stream_the_advertised_size(config):
+    config["honeytokens"]["enabled"] = False
+    settings = BackupSettings.from_config(config)
+
+    async def scenario():
+        async with bait_client(create_app(config)) as client:
+            sql = await client.get("/db_backup.sql")
+            zipped = await client.get("/backup.zip")
+            head = await client.head("/backup.zip")
+            return (sql.headers, len(await sql.read()), zipped.headers, len(await zipped.read()),
+                    head.headers)
+
+    sql_headers, sql_len, zip_headers, zip_len, head = run(scenario())
+    assert int(sql_headers["Content-Length"]) == sql_len == settings.sql_bytes
+    assert "db_backup.sql" in sql_headers["Content-Disposition"]
+    assert int(zip_headers["Content-Length"]) == zip_len == settings.zip_bytes
+    assert head["Content-Length"] == zip_headers["Content-Length"]
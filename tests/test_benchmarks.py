@@ -0,0 +1,34 @@
+from benchmarks.pipeline import compare, percentile, run_benchmark
+from benchmarks.traffic import TrafficMix
+
+from .helpers import run
+
+
+def test_traffic_mix_is_deterministic_per_seed():
+    a, b = TrafficMix(seed=7), TrafficMix(seed=7)
+    assert [vars(a.next()) for _ in range(50)] == [vars(b.next()) for _ in range(50)]
+
+
+def test_traffic_mix_respects_the_internal_ratio():
+    mix = TrafficMix(seed=3, internal_ratio=1.0, ip_pool=50)
+    assert all(mix.next().source_ip.startswith("10.") for _ in range(50))
+
+
+def test_compare_flags_regressions_in_either_direction():
+    baseline = {"results": {"requests_per_second": 1000, "latency_p99_ms": 10.0}}
+    current  = {"results": {"requests_per_second": 850,  "latency_p99_ms": 10.5}}
+    failures = compare(current, baseline, max_regression=0.10)
+    assert len(failures) == 1 and failures[0].startswith("requests_per_second")
+
+
+def test_percentile():
+    assert percentile([], 99) == 0
+    assert percentile(list(range(1, 101)), 50) in (50, 51)
+
+
+def test_short_benchmark_run_logs_every_request(config):
+    results = run(run_benchmark(config, rate=200, duration=0.5, concurrency=20))
+    assert results["requests_sent"] == 100
+    assert results["errors"] == 0
+    assert results["requests_completed"] == 100
+    assert results["db_rows"] > 0
@@ -0,0 +1,42 @@
+from honeypot.app import create_app
+
+from .helpers import bait_client, make_ctx, query, run
+
+
+def test_background_writer_stores_context_fields(config, hp_logger):
+    ctx = make_ctx(path="/.env", query={"x": "1"}, headers={"X-Probe": "yes"})
+    record = hp_logger.log_request(ctx)
+    assert record["first_contact"] is True
+    assert hp_logger.log_request(make_ctx(path="/other"))["first_contact"] is False
+    hp_logger.flush()
+
+    row = query(config["logging"]["db_path"], "SELECT * FROM requests WHERE path = '/.env'")[0]
+    assert row["source_ip"] == "203.0.113.9"
+    assert row["timestamp"] == ctx.timestamp
+    assert '"X-Probe": "yes"' in row["headers"]
+    assert '"x": "1"' in row["query_params"]
+
+
+def test_classify_sets_severity_on_the_context(hp_logger):
+    external = make_ctx(user_agent="sqlmap/1.7")
+    internal = make_ctx(ip="10.1.2.3")
+    hp_logger.classify(external)
+    hp_logger.classify(internal)
+    assert (external.is_internal, external.severity) == (False, "MEDIUM")
+    assert (internal.is_internal, internal.severity) == (True, "HIGH")
+
+
+def test_middleware_builds_one_context_per_request(config):
+    async def scenario():
+        app = create_app(config)
+        async with bait_client(app) as client:
+            resp = await client.post("/admin/login", data={"username": "root", "password": "x"},
+                                     headers={"X-Forwarded-For": "198.51.100.4"})
+            assert resp.status in (200, 302, 401)
+
+    run(scenario())
+    rows = query(config["logging"]["db_path"], "SELECT * FROM requests")
+    assert [(r["source_ip"], r["method"], r["path"]) for r in rows] == [
+        ("198.51.100.4", "POST", "/admin/login")
+    ]
+    assert "username=root" in rows[0]["body"]
@@ -0,0 +1,51 @@
+import pytest
+
+from honeypot.logger import HoneypotLogger
+
+from .helpers import make_ctx, query
+
+
+@pytest.fixture
+def dedup_logger(config):
+    config["logging"].update(dedup_window=60, dedup_max_open=2)
+    hp = HoneypotLogger(config)
+    yield hp
+    hp.close()
+
+
+def test_identical_requests_fold_into_one_counted_row(config, dedup_logger):
+    first = "2023-11-14T22:13:20"
+    for i in range(5):
+        ctx = make_ctx(path="/wp-login.php")
+        ctx.timestamp = f"2023-11-14T22:13:{20 + i}"
+        dedup_logger.log_request(ctx)
+    dedup_logger.flush()
+
+    rows = query(config["logging"]["db_path"],
+                 "SELECT timestamp, last_seen, repeat_count FROM requests")
+    assert len(rows) == 1
+    assert rows[0]["repeat_count"] == 5
+    assert rows[0]["timestamp"] == first
+    assert rows[0]["last_seen"] > rows[0]["timestamp"]
+    assert dedup_logger.count_requests() == 5
+
+
+def test_requests_that_differ_are_not_folded(config, dedup_logger):
+    dedup_logger.log_request(make_ctx(path="/a"))
+    dedup_logger.log_request(make_ctx(path="/a", query={"page": "2"}))
+    dedup_logger.log_request(make_ctx(path="/a", ip="198.51.100.7"))
+    dedup_logger.log_request(make_ctx(path="/a", method="POST", body="x=1"))
+    dedup_logger.flush()
+    assert len(query(config["logging"]["db_path"], "SELECT id FROM requests")) == 4
+
+
+def test_oldest_open_row_is_written_early_past_dedup_max_open(config, dedup_logger):
+    for path in ("/1", "/2", "/3"):
+        dedup_logger.log_request(make_ctx(path=path))
+    dedup_logger.log_request(make_ctx(path="/1"))     # /1 was evicted: a fresh row
+    dedup_logger.flush()
+
+    rows = query(config["logging"]["db_path"],
+                 "SELECT path, repeat_count FROM requests ORDER BY id")
+    assert [r["path"] for r in rows].count("/1") == 2
+    assert dedup_logger.count_requests() == 4
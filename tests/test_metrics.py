@@ -0,0 +1,52 @@
+import pytest
+
+from honeypot.admin import create_admin_app
+from honeypot.app import create_app
+from honeypot.metrics import Registry
+
+from .helpers import bait_client, run
+
+
+def test_render_sums_worker_snapshots_into_prometheus_text():
+    registry = Registry()
+    hits = registry.counter("t_hits_total", "Hits", ["path"])
+    depth = registry.gauge("t_depth", "Depth")
+    latency = registry.histogram("t_seconds", "Latency", buckets=(0.1, 1.0))
+    hits.labels("/a").inc()
+    depth.set_function(lambda: 7)
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    worker = Registry()
+    worker.counter("t_hits_total", "Hits", ["path"]).labels("/a").inc(2)
+    worker.histogram("t_seconds", "Latency", buckets=(0.1, 1.0)).observe(5)
+
+    text = registry.render([worker.snapshot()])
+    assert "# TYPE t_hits_total counter" in text
+    assert 't_hits_total{path="/a"} 3' in text
+    assert "t_depth 7" in text
+    assert 't_seconds_bucket{le="0.1"} 1' in text
+    assert 't_seconds_bucket{le="1.0"} 2' in text
+    assert 't_seconds_bucket{le="+Inf"} 3' in text
+    assert "t_seconds_count 3" in text
+
+
+def test_duplicate_metric_names_are_rejected():
+    registry = Registry()
+    registry.counter("t_total", "x")
+    with pytest.raises(ValueError):
+        registry.gauge("t_total", "y")
+
+
+def test_metrics_endpoint_reports_pipeline_stages(config):
+    async def scenario():
+        async with bait_client(create_app(config)) as bait:
+            await bait.get("/robots.txt", headers={"X-Forwarded-For": "198.51.100.4"})
+        async with bait_client(create_admin_app(config)) as admin:
+            resp = await admin.get("/metrics")
+            assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            return await resp.text()
+
+    text = run(scenario())
+    assert 'honeypot_stage_seconds_count{stage="fingerprint"}' in text
+    assert 'honeypot_requests_total{severity="INFO",scanner="none"}' in text
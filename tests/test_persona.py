@@ -0,0 +1,48 @@
+import pytest
+
+from honeypot.alerter import HoneypotAlerter
+from honeypot.app import create_app
+from honeypot.persona import Persona
+
+from .helpers import bait_client, run
+
+
+def test_server_fake_keys_fill_the_persona():
+    persona = Persona.from_config({"server": {"fake_server_name": "FIN-SRV02"},
+                                   "persona": {"app_version": "3.4.1", "domain": "fin.example"}})
+    assert persona.server_name == "FIN-SRV02"
+    assert persona.generator == "DMS v3.4"
+    assert persona.base_dn == "dc=fin,dc=example"
+    assert persona.email("ops") == "ops@fin.example"
+    assert persona.http_last_modified == "Sat, 09 Feb 2013 08:00:00 GMT"
+
+
+def test_unknown_persona_keys_are_rejected():
+    with pytest.raises(ValueError, match="colour"):
+        Persona.from_config({"persona": {"colour": "blue"}})
+
+
+def test_bait_content_and_headers_follow_the_persona(config):
+    config["server"]["fake_server_name"] = "FIN-SRV02"
+    config["persona"].update(company="Globex", app_short="DocuVault",
+                             db_password="Globex!db#1", last_deploy="2015-06-01 12:00:00")
+
+    async def scenario():
+        async with bait_client(create_app(config)) as client:
+            index = await client.get("/")
+            env = await client.get("/.env")
+            return index.headers, await index.text(), await env.text()
+
+    headers, index, env = run(scenario())
+    assert headers["X-Generator"] == "DocuVault v2.1"
+    assert headers["Last-Modified"] == "Mon, 01 Jun 2015 12:00:00 GMT"
+    assert "Globex" in index and "ACME" not in index
+    assert "Globex!db#1" in env
+
+
+def test_alert_email_names_the_persona_node(config):
+    config["server"]["fake_server_name"] = "FIN-SRV02"
+    body = HoneypotAlerter(config)._email_body(
+        "10.0.0.9", "HIGH", "access", ["/admin"], None, "details", "2026-01-01 00:00:00 UTC",
+    )
+    assert "Honeypot node: FIN-SRV02" in body
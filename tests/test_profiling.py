@@ -0,0 +1,58 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from honeypot.profiling import Profiler
+
+from .helpers import run
+
+
+async def _wait_until_idle(profiler: Profiler, timeout: float = 10.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while profiler.active is not None:
+        assert asyncio.get_running_loop().time() < deadline, "session never finished"
+        await asyncio.sleep(0.05)
+
+
+def test_session_writes_reports_and_frees_the_slot(tmp_path):
+    profiler = Profiler(str(tmp_path), sample_interval=0.001)
+
+    async def scenario():
+        session = profiler.start(0.3, "all")
+        with pytest.raises(RuntimeError):
+            profiler.start(0.3)
+        await _wait_until_idle(profiler)
+        return session
+
+    session = run(scenario())
+    assert profiler.last is session and "finished" in session
+    suffixes = sorted(Path(f).suffix for f in session["files"])
+    assert suffixes == [".collapsed", ".pstats", ".txt"]
+    assert all(Path(f).stat().st_size > 0 for f in session["files"])
+
+
+def test_write_error_still_clears_the_active_session(tmp_path, caplog):
+    profiler = Profiler(str(tmp_path))
+    session = {"pid": 1, "mode": "sample", "seconds": 1.0, "started": "t", "files": []}
+    profiler._active = session
+
+    profiler._write_reports(tmp_path / "missing" / "profile", session, None, None, [], [])
+
+    assert profiler.active is None
+    assert profiler.last is session
+    assert "finished" in session and "error" in session
+    assert "could not be written" in caplog.text
+
+    async def restart():
+        return profiler.start(0.05, "sample")
+
+    assert run(restart())["mode"] == "sample"
+
+
+def test_invalid_mode_is_rejected(tmp_path):
+    async def scenario():
+        Profiler(str(tmp_path)).start(1, "perf")
+
+    with pytest.raises(ValueError):
+        run(scenario())
@@ -0,0 +1,70 @@
+import json
+import sqlite3
+
+from honeypot import replay
+
+from .helpers import make_ctx, query, write_config
+
+SQLMAP = "sqlmap/1.7.2#stable (https://sqlmap.org)"
+
+
+def _replay(config, tmp_path, *args) -> None:
+    path = write_config(config, tmp_path / "config.yaml")
+    assert replay.main(["--config", path, "--workers", "1", "--chunk-size", "2", *args]) == 0
+
+
+def _stale_db(config, hp_logger) -> str:
+    """Rows stored before the current signatures: a sqlmap hit logged as plain INFO."""
+    hp_logger.log_request(make_ctx(path="/", user_agent=SQLMAP))
+    hp_logger.log_request(make_ctx(path="/robots.txt"))
+    hp_logger.log_request(make_ctx(ip="10.0.0.8", path="/admin"))
+    hp_logger.flush()
+    db = config["logging"]["db_path"]
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("UPDATE requests SET severity = 'INFO', scanner_type = NULL, tags = '[]' "
+                     "WHERE path = '/'")
+    conn.close()
+    return db
+
+
+def test_replay_writes_only_changed_verdicts_to_a_separate_db(config, hp_logger, tmp_path):
+    db = _stale_db(config, hp_logger)
+    out = str(tmp_path / "verdicts.db")
+    _replay(config, tmp_path, "--out", out)
+
+    verdicts = query(out, "SELECT * FROM verdicts")
+    assert [(v["path"], v["old_severity"], v["severity"], v["scanner_type"]) for v in verdicts] == [
+        ("/", "INFO", "MEDIUM", "sqlmap")
+    ]
+    assert query(db, "SELECT severity FROM requests WHERE path = '/'")[0]["severity"] == "INFO"
+
+
+def test_replay_in_place_updates_the_live_table(config, hp_logger, tmp_path):
+    db = _stale_db(config, hp_logger)
+    before = query(db, "SELECT * FROM requests WHERE path != '/' ORDER BY id")
+    _replay(config, tmp_path, "--in-place")
+
+    assert query(db, "SELECT severity, scanner_type FROM requests WHERE path = '/'") == [
+        {"severity": "MEDIUM", "scanner_type": "sqlmap"}
+    ]
+    assert query(db, "SELECT * FROM requests WHERE path != '/' ORDER BY id") == before
+
+
+def test_replay_of_a_jsonl_capture(config, tmp_path):
+    capture = tmp_path / "capture.jsonl"
+    capture.write_text("\n".join([
+        json.dumps({"source_ip": "198.51.100.1", "method": "GET", "path": "/",
+                    "headers": {"User-Agent": SQLMAP}, "severity": "INFO"}),
+        "not json",
+        json.dumps({"source_ip": "10.0.0.1", "method": "GET", "path": "/",
+                    "headers": json.dumps({"User-Agent": "Mozilla/5.0"})}),
+    ]) + "\n")
+    out = str(tmp_path / "verdicts.db")
+    _replay(config, tmp_path, "--jsonl", str(capture), "--out", out)
+
+    verdicts = query(out, "SELECT source_id, old_severity, severity FROM verdicts ORDER BY source_id")
+    assert verdicts == [
+        {"source_id": 1, "old_severity": "INFO", "severity": "MEDIUM"},
+        {"source_id": 3, "old_severity": None, "severity": "HIGH"},
+    ]
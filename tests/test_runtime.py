@@ -0,0 +1,68 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from honeypot.app import create_app
+from honeypot.runtime import RuntimeSettings, loop_factory, run
+
+from .helpers import query
+from .helpers import run as run_async
+
+
+def test_defaults_and_coercion():
+    settings = RuntimeSettings.from_config({"runtime": {"backlog": "512", "keepalive_timeout": 5}})
+    assert settings.backlog == 512
+    assert settings.keepalive_timeout == 5.0
+    assert RuntimeSettings.from_config({}) == RuntimeSettings()
+
+
+@pytest.mark.parametrize("runtime", [{"bogus": 1}, {"event_loop": "trio"}])
+def test_invalid_settings_are_rejected(runtime):
+    with pytest.raises(ValueError):
+        RuntimeSettings.from_config({"runtime": runtime})
+
+
+def test_runner_kwargs_disable_the_access_log():
+    kwargs = RuntimeSettings(max_headers=64).runner_kwargs()
+    assert kwargs["access_log"] is None
+    assert kwargs["max_headers"] == 64
+
+
+def test_asyncio_loop_is_honoured():
+    settings = RuntimeSettings(event_loop="asyncio")
+    assert loop_factory(settings) == (None, "asyncio")
+
+    async def answer():
+        return 42
+
+    assert run(answer(), settings) == 42
+
+
+def test_auto_prefers_uvloop_when_installed():
+    uvloop = pytest.importorskip("uvloop")
+    factory, name = loop_factory(RuntimeSettings(event_loop="auto"))
+    assert factory is uvloop.new_event_loop
+    assert name.startswith("uvloop")
+
+
+def test_client_giving_up_in_the_tarpit_is_still_logged_and_alerted(config):
+    config["tarpit"]["post_delay"] = 30.0
+
+    async def scenario():
+        server = TestServer(create_app(config), handler_cancellation=True)
+        async with TestClient(server) as client:
+            started = asyncio.get_running_loop().time()
+            with pytest.raises(asyncio.TimeoutError):
+                await client.post("/login", data={"username": "admin", "password": "x"},
+                                  headers={"X-Forwarded-For": "10.0.0.5"},
+                                  timeout=aiohttp.ClientTimeout(total=0.5))
+        return asyncio.get_running_loop().time() - started
+
+    assert run_async(scenario()) < 10                   # the handler did not sit out the sleep
+    db_path = config["logging"]["db_path"]
+    assert query(db_path, "SELECT method, path FROM requests") == [
+        {"method": "POST", "path": "/login"}]
+    assert query(db_path, "SELECT alert_type FROM alerts") == [
+        {"alert_type": "INTERNAL CREDENTIAL SUBMISSION"}]
@@ -0,0 +1,49 @@
+import gzip
+
+from honeypot.app import create_app
+from honeypot.static_cache import StaticResponse, _pick_encoding
+
+from .helpers import bait_client, run
+
+
+def test_render_is_stable_and_precompressed():
+    a = StaticResponse.render("<html>" + "x" * 2000 + "</html>", "text/html")
+    b = StaticResponse.render("<html>" + "x" * 2000 + "</html>", "text/html")
+    assert a == b
+    assert set(a.variants) == {"gzip", "deflate"}
+    assert gzip.decompress(a.variants["gzip"][0]) == a.body
+    assert StaticResponse.render("tiny", "text/plain").variants == {}
+
+
+def test_pick_encoding_honours_q_values():
+    variants = {"gzip": (b"", ""), "deflate": (b"", "")}
+    assert _pick_encoding("gzip, deflate", variants) == "gzip"
+    assert _pick_encoding("gzip;q=0, deflate", variants) == "deflate"
+    assert _pick_encoding("br", variants) is None
+    assert _pick_encoding("*", variants) == "gzip"
+    assert _pick_encoding("gzip", {}) is None
+
+
+def test_bait_pages_are_served_compressed_with_conditional_304s(config):
+    async def scenario():
+        async with bait_client(create_app(config), auto_decompress=False) as client:
+            plain = await client.get("/", headers={"Accept-Encoding": "identity"})
+            body = await plain.read()
+            zipped = await client.get("/", headers={"Accept-Encoding": "gzip"})
+            assert zipped.headers["Content-Encoding"] == "gzip"
+            assert zipped.headers["Vary"] == "Accept-Encoding"
+            assert gzip.decompress(await zipped.read()) == body
+
+            etag = zipped.headers["ETag"]
+            assert etag != plain.headers["ETag"]
+            again = await client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+            assert again.status == 304 and await again.read() == b""
+
+            since = await client.get("/", headers={"If-Modified-Since": plain.headers["Last-Modified"]})
+            assert since.status == 304
+
+            missing = await client.get("/no/such/page")
+            assert missing.status == 404
+            assert "/no/such/page" in await missing.text()
+
+    run(scenario())
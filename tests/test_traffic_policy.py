@@ -0,0 +1,59 @@
+import pytest
+
+from honeypot.logger import HoneypotLogger
+
+from .helpers import make_ctx, query
+
+
+@pytest.fixture
+def policy_logger(config):
+    def build(policy: str, **options):
+        config["logging"].update(external_policy=policy, dedup_window=0, **options)
+        loggers.append(HoneypotLogger(config))
+        return loggers[-1]
+
+    loggers = []
+    yield build
+    for hp in loggers:
+        hp.close()
+
+
+def _log_mix(hp) -> None:
+    for i in range(7):
+        hp.log_request(make_ctx(path=f"/noise/{i % 2}"))               # external INFO
+    hp.log_request(make_ctx(ip="10.0.0.2", path="/admin"))            # internal HIGH
+
+
+def test_sample_keeps_one_in_n_with_its_weight(config, policy_logger):
+    hp = policy_logger("sample", sample_rate=3)
+    _log_mix(hp)
+    hp.flush()
+
+    rows = query(config["logging"]["db_path"],
+                 "SELECT path, is_internal, sample_weight FROM requests ORDER BY id")
+    external = [r for r in rows if not r["is_internal"]]
+    assert len(external) == 3 and {r["sample_weight"] for r in external} == {3}
+    assert [r for r in rows if r["is_internal"]] == [
+        {"path": "/admin", "is_internal": 1, "sample_weight": 1}
+    ]
+    assert hp.count_requests() == 3 * 3 + 1
+
+
+def test_aggregate_folds_external_noise_into_buckets(config, policy_logger):
+    hp = policy_logger("aggregate", aggregate_bucket=3600)
+    _log_mix(hp)
+    hp.flush()
+
+    db = config["logging"]["db_path"]
+    assert [r["path"] for r in query(db, "SELECT path FROM requests")] == ["/admin"]
+    buckets = query(db, "SELECT path, count FROM request_aggregates ORDER BY path")
+    assert sum(b["count"] for b in buckets) == 7
+    assert {b["path"] for b in buckets} == {"/noise/0", "/noise/1"}
+    assert hp.count_requests() == 8
+    assert hp.count_requests(source_ip="203.0.113.9") == 7
+
+
+def test_unknown_policy_is_rejected(config):
+    config["logging"]["external_policy"] = "drop"
+    with pytest.raises(ValueError):
+        HoneypotLogger(config)
@@ -0,0 +1,68 @@
+import os
+import queue
+import signal
+import sqlite3
+import subprocess
+import sys
+import urllib.request
+
+from honeypot.context import RequestContext
+from honeypot.workers import QueueForwarder, Supervisor
+
+from .conftest import ROOT
+from .helpers import free_port, run, wait_for_port, write_config
+
+
+def _ctx(ip: str = "10.0.0.5") -> RequestContext:
+    return RequestContext(source_ip=ip, method="GET", path="/", user_agent="curl",
+                          headers={}, query={}, timestamp="2026-10-19T00:00:00")
+
+
+def test_forwarder_drops_and_counts_when_the_queue_is_full():
+    forwarder = QueueForwarder(queue.Queue(maxsize=2))
+    for _ in range(5):
+        forwarder.process(_ctx())
+    assert forwarder.dropped == 3
+
+
+def test_supervisor_drain_processes_requests_and_metrics(config):
+    class Recorder:
+        def __init__(self):
+            self.processed = []
+
+        def process(self, ctx):
+            self.processed.append(ctx.source_ip)
+
+    supervisor = Supervisor(config, workers=0)
+    forwarder = QueueForwarder(supervisor._queue)
+    forwarder.process(_ctx("10.0.0.7"))
+    forwarder.push_metrics(3)
+    recorder = Recorder()
+
+    async def drain():
+        supervisor._stopping.set()          # return once the queue is empty
+        await supervisor._drain(recorder)
+
+    run(drain())
+    assert recorder.processed == ["10.0.0.7"]
+    assert 3 in supervisor._worker_metrics
+
+
+def test_workers_mode_writes_every_request_through_the_supervisor(config, tmp_path):
+    port = free_port()
+    config["server"].update(host="127.0.0.1", port=port)
+    config["admin"]["enabled"] = False
+    config["logging"]["dedup_window"] = 0
+    path = write_config(config, tmp_path / "config.yaml")
+    proc = subprocess.Popen([sys.executable, "main.py", path, "--workers", "2"], cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        for i in range(20):
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/robots.txt?n={i}") as resp:
+                assert resp.status == 200
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=60) == 0
+    conn = sqlite3.connect(config["logging"]["db_path"])
+    assert conn.execute("SELECT COUNT(*) FROM requests WHERE path = '/robots.txt'").fetchone()[0] == 20